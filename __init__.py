@@ -12,60 +12,37 @@ bl_info = {
 
 def reload_modules(name):
     '''
-    This makes sure all modules are reloaded from new files, when the addon is removed and a new version is installed in the same session,
+    This makes sure modules are reloaded from new files, when the addon is removed and a new version is installed in the same session,
     or when Blender's 'Reload Scripts' operator is run manually.
-    It's important, that utils modules are reloaded first, as operators and menus import from them
+    Only modules, whose source changed since the last registration are reloaded, together with all modules importing from them.
+    It's important, that modules are reloaded after the ones they import from, e.g. utils modules before the operators and menus using them
     '''
 
-    import os
+    import sys
     import importlib
+    from . utils.developer import ProfileTree, get_changed_modules, get_import_graph, get_reload_order
 
+    # time the reloading, the profile is handed over to the reloaded developer module at the end, and becomes part of the registration profile
+    tree = ProfileTree('reload_modules')
 
-    # first update the classes and keys dicts, the properties, items, colors
-    from . import registration, items, colors
+    # the module states recorded at the end of the previous registration, survive the reload until here
+    states = globals().get('module_states', {})
 
-    for module in [registration, items, colors]:
-        print("reloading", module.__name__)
-        importlib.reload(module)
+    with tree.section('import graph'):
+        changed = get_changed_modules(__name__, states)
+        graph = get_import_graph(__name__)
+        order = get_reload_order(graph, changed)
 
-    # then fetch and reload all utils modules
-    utils_modules = sorted([name[:-3] for name in os.listdir(os.path.join(__path__[0], "utils")) if name.endswith('.py')])
+    for module in order:
+        with tree.section(module) as node:
+            importlib.reload(sys.modules[module])
 
-    for module in utils_modules:
-        impline = "from . utils import %s" % (module)
+        print(f"reloading {module}: {node['time'] * 1000:.2f}ms{'' if module in changed else ', dependent'}")
 
-        print("reloading %s" % (".".join([name] + ['utils'] + [module])))
+    print(f"{name} reloaded {len(order)} of {len(graph)} modules, {len(changed)} changed")
 
-        exec(impline)
-        importlib.reload(eval(module))
-
-
-    from . import handlers
-    print("reloading", handlers.__name__)
-    importlib.reload(handlers)
-
-    # and based on that, reload the modules containing operator and menu classes
-    modules = []
-
-    for label in registration.classes:
-        entries = registration.classes[label]
-        for entry in entries:
-            path = entry[0].split('.')
-            module = path.pop(-1)
-
-            if (path, module) not in modules:
-                modules.append((path, module))
-
-    for path, module in modules:
-        if path:
-            impline = "from . %s import %s" % (".".join(path), module)
-        else:
-            impline = "from . import %s" % (module)
-
-        print("reloading %s" % (".".join([name] + path + [module])))
-
-        exec(impline)
-        importlib.reload(eval(module))
+    from . utils import developer
+    developer.startup_profile = tree
 
 
 if 'bpy' in locals():
@@ -73,16 +50,22 @@ if 'bpy' in locals():
 
 import bpy
 from bpy.props import PointerProperty, BoolProperty
+import os
+import time
 from . properties import M3SceneProperties, M3ObjectProperties
-from . utils.registration import get_core, get_tools, get_pie_menus
-from . utils.registration import register_classes, unregister_classes, register_keymaps, unregister_keymaps, register_icons, unregister_icons, register_msgbus, unregister_msgbus
+from . utils.registration import get_core, get_tools, get_pie_menus, get_prefs
+from . utils.developer import set_profiling, start_startup_profile, finish_startup_profile, profile_section, get_module_states
+from . utils.registration import register_classes, print_registration_timings, unregister_classes, register_keymaps, unregister_keymaps, register_icons, unregister_icons, warm_up_icons, register_msgbus, unregister_msgbus
 from . ui.menus import object_context_menu, mesh_context_menu, add_object_buttons, material_pick_button, outliner_group_toggles, cursor_spin
-from . handlers import update_object_axes_drawing, focus_HUD, surface_slide_HUD, update_group, update_msgbus, screencast_HUD
+from . handlers import update_object_axes_drawing, update_object_axes_frame, update_HUDs, remove_HUDs, update_group, reset_group_index, update_msgbus
 
 
 def register():
     global classes, keymaps, icons, owner
 
+    start_startup_profile('register')
+
+
     # CORE
 
     core_classes = register_classes(get_core())
@@ -90,34 +73,35 @@ def register():
 
     # PROPERTIES
 
-    bpy.types.Scene.M3 = PointerProperty(type=M3SceneProperties)
-    bpy.types.Object.M3 = PointerProperty(type=M3ObjectProperties)
+    with profile_section('properties'):
+        bpy.types.Scene.M3 = PointerProperty(type=M3SceneProperties)
+        bpy.types.Object.M3 = PointerProperty(type=M3ObjectProperties)
 
-    bpy.types.WindowManager.M3_screen_cast = BoolProperty()
+        bpy.types.WindowManager.M3_screen_cast = BoolProperty()
 
 
     # TOOLS, PIE MENUS, KEYMAPS, MENUS
 
-    tool_classlists, tool_keylists, tool_count = get_tools()
-    pie_classlists, pie_keylists, pie_count = get_pie_menus()
+    classes = core_classes
+    keymaps = []
 
-    classes = register_classes(tool_classlists + pie_classlists) + core_classes
-    keymaps = register_keymaps(tool_keylists + pie_keylists)
-
-    bpy.types.VIEW3D_MT_object_context_menu.prepend(object_context_menu)
-    bpy.types.VIEW3D_MT_edit_mesh_context_menu.prepend(mesh_context_menu)
-
-    bpy.types.VIEW3D_MT_edit_mesh_extrude.append(cursor_spin)
-    bpy.types.VIEW3D_MT_mesh_add.prepend(add_object_buttons)
-    bpy.types.VIEW3D_MT_editor_menus.append(material_pick_button)
-    bpy.types.OUTLINER_HT_header.prepend(outliner_group_toggles)
+    # with deferred registration, tools and pies are registered once Blender's event loop runs, so they don't hold up the startup, but still cost the same
+    # the timer has to be persistent, or loading a .blend passed in on the command line removes it before it fires
+    if get_prefs().defer_registration and not bpy.app.background:
+        bpy.app.timers.register(register_tools, first_interval=0, persistent=True)
 
+    else:
+        register_tools()
 
 
     # ICONS
 
     icons = register_icons()
 
+    # optionally load the icons in the background after startup, instead of when they are first drawn
+    if get_prefs().warm_up_icons and not bpy.app.background:
+        bpy.app.timers.register(warm_up_icons, first_interval=1)
+
 
     # MSGBUS
 
@@ -127,22 +111,77 @@ def register():
 
     # HANDLERS
 
-    bpy.app.handlers.load_post.append(update_msgbus)
+    with profile_section('handlers'):
+        bpy.app.handlers.load_post.append(update_msgbus)
+
+        bpy.app.handlers.undo_pre.append(update_object_axes_drawing)
+        bpy.app.handlers.redo_pre.append(update_object_axes_drawing)
+        bpy.app.handlers.load_pre.append(update_object_axes_drawing)
+
+        bpy.app.handlers.frame_change_post.append(update_object_axes_frame)
 
-    bpy.app.handlers.undo_pre.append(update_object_axes_drawing)
-    bpy.app.handlers.redo_pre.append(update_object_axes_drawing)
-    bpy.app.handlers.load_pre.append(update_object_axes_drawing)
+        bpy.app.handlers.load_post.append(reset_group_index)
+        bpy.app.handlers.undo_post.append(reset_group_index)
+        bpy.app.handlers.redo_post.append(reset_group_index)
 
-    bpy.app.handlers.depsgraph_update_post.append(focus_HUD)
-    bpy.app.handlers.depsgraph_update_post.append(surface_slide_HUD)
-    bpy.app.handlers.depsgraph_update_post.append(update_group)
-    bpy.app.handlers.depsgraph_update_post.append(screencast_HUD)
+        bpy.app.handlers.depsgraph_update_post.append(update_HUDs)
+        bpy.app.handlers.depsgraph_update_post.append(update_group)
+
+
+    # PROFILING
+
+    set_profiling(get_prefs().profiling)
+
+
+def register_tools():
+    '''
+    register the tool and pie classes, keymaps and menus, either directly or deferred to the first event loop tick
+    note, that deferring only moves this work after startup, it's the same full registration, there are no lightweight stand-ins
+    with benchmarking enabled, import and registration times are reported per module, not per tool
+    '''
+
+    global module_states
+
+    start = time.perf_counter()
+
+    # benchmark, if enabled in the prefs, or when run via resources/profile_startup.py
+    benchmark = get_prefs().benchmark_registration or bool(os.environ.get('MACHIN3TOOLS_PROFILE_STARTUP'))
+    timings = {} if benchmark else None
+
+    with profile_section('tools'):
+        tool_classlists, tool_keylists, tool_count = get_tools()
+        pie_classlists, pie_keylists, pie_count = get_pie_menus()
+
+        # tool classes go first, so they are unregistered before the core classes
+        classes[:0] = register_classes(tool_classlists + pie_classlists, timings=timings)
+        keymaps.extend(register_keymaps(tool_keylists + pie_keylists))
+
+    with profile_section('menus'):
+        bpy.types.VIEW3D_MT_object_context_menu.prepend(object_context_menu)
+        bpy.types.VIEW3D_MT_edit_mesh_context_menu.prepend(mesh_context_menu)
+
+        bpy.types.VIEW3D_MT_edit_mesh_extrude.append(cursor_spin)
+        bpy.types.VIEW3D_MT_mesh_add.prepend(add_object_buttons)
+        bpy.types.VIEW3D_MT_editor_menus.append(material_pick_button)
+        bpy.types.OUTLINER_HT_header.prepend(outliner_group_toggles)
+
+
+    # MODULE STATES
+
+    # all modules are loaded now, so record what reload_modules() compares against on the next 'Reload Scripts'
+    with profile_section('module states'):
+        module_states = get_module_states(__name__)
 
 
     # REGISTRATION OUTPUT
 
     print(f"Registered {bl_info['name']} {'.'.join([str(i) for i in bl_info['version']])} with {tool_count} {'tool' if tool_count == 1 else 'tools'}, {pie_count} pie {'menu' if pie_count == 1 else 'menus'}")
 
+    if timings is not None:
+        print_registration_timings(timings, total=time.perf_counter() - start)
+
+    finish_startup_profile(persist=benchmark, debug=benchmark, version='.'.join([str(i) for i in bl_info['version']]), blender=bpy.app.version_string, deferred=get_prefs().defer_registration, date=time.strftime('%Y-%m-%d %H:%M:%S'))
+
 
 def unregister():
     global classes, keymaps, icons, owner
@@ -155,21 +194,16 @@ def unregister():
     bpy.app.handlers.redo_pre.remove(update_object_axes_drawing)
     bpy.app.handlers.load_pre.remove(update_object_axes_drawing)
 
-    from . handlers import focusHUD, surfaceslideHUD, screencastHUD
-
-    if focusHUD and "RNA_HANDLE_REMOVED" not in str(focusHUD):
-        bpy.types.SpaceView3D.draw_handler_remove(focusHUD, 'WINDOW')
+    bpy.app.handlers.frame_change_post.remove(update_object_axes_frame)
 
-    if surfaceslideHUD and "RNA_HANDLE_REMOVED" not in str(surfaceslideHUD):
-        bpy.types.SpaceView3D.draw_handler_remove(surfaceslideHUD, 'WINDOW')
+    bpy.app.handlers.load_post.remove(reset_group_index)
+    bpy.app.handlers.undo_post.remove(reset_group_index)
+    bpy.app.handlers.redo_post.remove(reset_group_index)
 
-    if screencastHUD and "RNA_HANDLE_REMOVED" not in str(screencastHUD):
-        bpy.types.SpaceView3D.draw_handler_remove(screencastHUD, 'WINDOW')
+    remove_HUDs()
 
-    bpy.app.handlers.depsgraph_update_post.remove(focus_HUD)
-    bpy.app.handlers.depsgraph_update_post.remove(surface_slide_HUD)
+    bpy.app.handlers.depsgraph_update_post.remove(update_HUDs)
     bpy.app.handlers.depsgraph_update_post.remove(update_group)
-    bpy.app.handlers.depsgraph_update_post.remove(screencast_HUD)
 
 
     # MSGBUS
@@ -179,6 +213,12 @@ def unregister():
 
     # TOOLS, PIE MENUS, KEYMAPS, MENUS
 
+    # the addon may be unregistered before the deferred registration ran, then close the startup profile, as register_tools() won't
+    if bpy.app.timers.is_registered(register_tools):
+        bpy.app.timers.unregister(register_tools)
+
+        finish_startup_profile(deferred=True, cancelled=True)
+
     bpy.types.VIEW3D_MT_object_context_menu.remove(object_context_menu)
     bpy.types.VIEW3D_MT_edit_mesh_context_menu.remove(mesh_context_menu)
 
@@ -1,38 +1,190 @@
 import bpy
 from bpy.app.handlers import persistent
-from . utils.draw import remove_object_axes_drawing_handler, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD
+from . utils.draw import remove_object_axes_drawing_handler, tag_object_axes, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD
 from . utils.registration import get_prefs, reload_msgbus, get_addon
-from . utils.group import update_group_name, select_group_children
-
-
-focusHUD = None
-surfaceslideHUD = None
-screencastHUD = None
+from . utils.group import update_group_name, select_group_children, reset_group_names, bump_group_polls_epoch
+from . utils.developer import profile
+from . utils.object import check_hierarchy, invalidate_hierarchy, reset_hierarchy_changes
 
 
 @persistent
+@profile('update_msgbus')
 def update_msgbus(none):
     reload_msgbus()
 
 
 @persistent
+@profile('update_object_axes_drawing')
 def update_object_axes_drawing(none):
     remove_object_axes_drawing_handler()
 
 
 @persistent
-def update_group(none):
+@profile('update_object_axes_frame')
+def update_object_axes_frame(scene, depsgraph=None):
+
+    # frame changes don't come in as transform updates in depsgraph_update_post, but animated objects may have moved
+    if 'draw_object_axes' in bpy.app.driver_namespace:
+        tag_object_axes()
+
+
+# index of group empties by pointer, holding the object and its last seen selection state, None for empties that haven't been processed yet
+# the objects are referenced directly, as looking them up by name scans all objects, so the index is rebuilt when objects were removed, like the hierarchy index
+group_empties = {}
+group_index_count = 0
+group_index_dirty = True
+group_last_active = None
+group_last_hide = None
+
+
+@persistent
+@profile('reset_group_index')
+def reset_group_index(none):
+    global group_index_dirty
+    group_index_dirty = True
+
+    invalidate_hierarchy()
+    reset_hierarchy_changes()
+    reset_group_names()
+    bump_group_polls_epoch()
+
+
+def build_group_index(keep_states=False):
+    """
+    index all group empties in a single pass, optionally keeping the selection states of the empties, that were indexed before
+    """
+
+    global group_empties, group_index_count, group_index_dirty
+
+    states = {ptr: entry[1] for ptr, entry in group_empties.items()} if keep_states else {}
+
+    group_empties = {obj.as_pointer(): [obj, states.get(obj.as_pointer())] for obj in bpy.data.objects if obj.M3.is_group_empty}
+    group_index_count = len(bpy.data.objects)
+    group_index_dirty = False
+
+
+def update_group_index(depsgraph):
+    """
+    add or remove objects from the group empty index, based on the objects reported in the depsgraph updates
+    if objects were removed, the index is rebuilt, as the references of removed objects can't be accessed anymore
+    """
+
+    global group_index_count
+
+    if len(bpy.data.objects) < group_index_count:
+        build_group_index(keep_states=True)
+        return
+
+    group_index_count = len(bpy.data.objects)
+
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object):
+            obj = update.id.original
+            ptr = obj.as_pointer()
+
+            if obj.M3.is_group_empty:
+                if ptr not in group_empties:
+                    group_empties[ptr] = [obj, None]
+
+            elif ptr in group_empties:
+                del group_empties[ptr]
+
+
+def set_group_empty_display(group, selected):
+    """
+    show or hide the passed in group empty, but only write the properties if they actually change, to avoid triggering more depsgraph updates
+    """
+
+    if selected:
+        if not group.show_name:
+            group.show_name = True
+
+        if group.empty_display_size != group.M3.group_size:
+            group.empty_display_size = group.M3.group_size
+
+    else:
+        if group.show_name:
+            group.show_name = False
+
+        # store existing non-zero size
+        if round(group.empty_display_size, 4) != 0.0001:
+            if group.M3.group_size != group.empty_display_size:
+                group.M3.group_size = group.empty_display_size
+
+            group.empty_display_size = 0.0001
+
+
+@persistent
+@profile('update_group')
+def update_group(scene, depsgraph=None):
+    """
+    instead of scanning all visible objects on every depsgraph update, only the indexed group empties are checked
+    and group empties are only selected and shown/hidden, when their selection state actually changed
+    """
+
+    global group_last_active, group_last_hide
+
     context = bpy.context
 
+    # selection or group changes come in as depsgraph updates, so the cached group polls have to be re-evaluated
+    bump_group_polls_epoch()
+
+    # drop the cached parent -> children index, if the object relations changed
+    if depsgraph:
+        check_hierarchy(depsgraph)
+    else:
+        invalidate_hierarchy()
+        reset_hierarchy_changes()
+
     if context.mode == 'OBJECT':
+        m3 = context.scene.M3
+
+        if group_index_dirty or depsgraph is None:
+            build_group_index()
+            transform_only = False
+
+        else:
+            update_group_index(depsgraph)
+
+            # while dragging, the updates only report object transforms, selection can't change then
+            transform_only = bool(depsgraph.updates) and all(isinstance(update.id, bpy.types.Object) and update.is_updated_transform for update in depsgraph.updates)
 
         # avoid AttributeError: 'Context' object has no attribute 'active_object'
         active = context.active_object if getattr(context, 'active_object', None) and context.active_object.M3.is_group_empty and context.active_object.select_get() else None
 
+        # re-process all groups, if group hiding was toggled
+        if m3.group_hide != group_last_hide:
+            group_last_hide = m3.group_hide
+
+            for entry in group_empties.values():
+                entry[1] = None
+
+        # the group empties, whose selection state changed since the last update
+        changed = []
+
+        for ptr, entry in ([] if transform_only else list(group_empties.items())):
+            group, was_selected = entry
+
+            if not group.M3.is_group_empty:
+                del group_empties[ptr]
+                continue
+
+            if not group.visible_get():
+                continue
+
+            selected = group.select_get()
+
+            if selected != was_selected:
+                entry[1] = selected
+                changed.append((group, selected))
+
+
         # AUTO SELECT
 
-        if context.scene.M3.group_select and active:
-            select_group_children(context.view_layer, active, recursive=context.scene.M3.group_recursive_select)
+        if m3.group_select and active and (changed or active.name != group_last_active):
+            select_group_children(context.view_layer, active, recursive=m3.group_recursive_select)
+
+        group_last_active = active.name if active else None
 
 
         # STORE USER-SET EMPTY SIZE
@@ -45,85 +197,98 @@ def update_group(none):
 
         # HIDE / UNHIDE
 
-        if context.scene.M3.group_hide and getattr(context, 'visible_objects', None):
-            selected = [obj for obj in context.visible_objects if obj.M3.is_group_empty and obj.select_get()]
-            unselected = [obj for obj in context.visible_objects if obj.M3.is_group_empty and not obj.select_get()]
+        if m3.group_hide:
+            for group, selected in changed:
+                set_group_empty_display(group, selected)
 
-            if selected:
-                for group in selected:
-                    group.show_name = True
-                    group.empty_display_size = group.M3.group_size
 
-            if unselected:
-                for group in unselected:
-                    group.show_name = False
+# HUD DISPATCH
 
-                    # store existing non-zero size
-                    if round(group.empty_display_size, 4) != 0.0001:
-                        group.M3.group_size = group.empty_display_size
+# the state the HUDs depend on, and their draw handlers, which are only added or removed when the state changes
+hud_state = {'focus': False,
+             'surface_slide': False,
+             'screen_cast': False}
 
-                    group.empty_display_size = 0.0001
+hud_handlers = {'focus': None,
+                'surface_slide': None,
+                'screen_cast': None}
 
+# the active object, the surface slide state was last derived from
+hud_last_active = None
 
-@persistent
-def focus_HUD(scene):
-    global focusHUD
 
-    # if you unregister the addon, the handle will somehow stay arround as a capsule object with the following name
-    # despite that, the object will return True, and so we need to check for this or no new handler will be created when re-registering
-    if focusHUD and "RNA_HANDLE_REMOVED" in str(focusHUD):
-        focusHUD = None
+def get_HUD_args(name):
+    if name == 'focus':
+        return draw_focus_HUD, (bpy.context, (1, 1, 1), 1, 2)
 
-    history = scene.M3.focus_history
+    elif name == 'surface_slide':
+        return draw_surface_slide_HUD, (bpy.context, (0, 1, 0), 1, 2)
 
-    if history:
-        if not focusHUD:
-            focusHUD = bpy.types.SpaceView3D.draw_handler_add(draw_focus_HUD, (bpy.context, (1, 1, 1), 1, 2), 'WINDOW', 'POST_PIXEL')
+    elif name == 'screen_cast':
+        return draw_screen_cast_HUD, (bpy.context, )
 
-    elif focusHUD:
-        bpy.types.SpaceView3D.draw_handler_remove(focusHUD, 'WINDOW')
-        focusHUD = None
 
+def has_surface_slide(obj):
+    return bool([mod for mod in obj.modifiers if mod.type == 'SHRINKWRAP' and 'SurfaceSlide' in mod.name]) if obj else False
 
-@persistent
-def surface_slide_HUD(scene):
-    global surfaceslideHUD
 
-    # if you unregister the addon, the handle will somehow stay arround as a capsule object with the following name
-    # despite that, the object will return True, and so we need to check for this or no new handler will be created when re-registering
-    if surfaceslideHUD and "RNA_HANDLE_REMOVED" in str(surfaceslideHUD):
-        surfaceslideHUD = None
+def update_HUD_state(scene, depsgraph=None):
+    '''
+    update the HUD state model from cheap lookups, the active's modifiers are only checked if the active changed or its geometry was updated
+    '''
+
+    global hud_last_active
+
+    hud_state['focus'] = bool(scene.M3.focus_history)
+    hud_state['screen_cast'] = getattr(bpy.context.window_manager, 'M3_screen_cast', False)
 
     # avoid AttributeError: 'Context' object has no attribute 'active_object'
     active = getattr(bpy.context, 'active_object', None)
 
     if active:
-        surfaceslide = [mod for mod in active.modifiers if mod.type == 'SHRINKWRAP' and 'SurfaceSlide' in mod.name]
+        if depsgraph is None or active.name != hud_last_active or any(isinstance(update.id, bpy.types.Object) and update.id.original == active and update.is_updated_geometry for update in depsgraph.updates):
+            hud_state['surface_slide'] = has_surface_slide(active)
 
-        if surfaceslide and not surfaceslideHUD:
-            surfaceslideHUD = bpy.types.SpaceView3D.draw_handler_add(draw_surface_slide_HUD, (bpy.context, (0, 1, 0), 1, 2), 'WINDOW', 'POST_PIXEL')
+    # like before, the surface slide HUD stays, while there is no active object
+    hud_last_active = active.name if active else None
 
-        elif surfaceslideHUD and not surfaceslide:
-            bpy.types.SpaceView3D.draw_handler_remove(surfaceslideHUD, 'WINDOW')
-            surfaceslideHUD = None
 
+def sync_HUDs():
+    '''
+    add or remove draw handlers, but only on state transitions
+    '''
 
-@persistent
-def screencast_HUD(scene):
-    global screencastHUD
+    for name, enabled in hud_state.items():
+        handler = hud_handlers[name]
+
+        # if you unregister the addon, the handle will somehow stay arround as a capsule object with the following name
+        # despite that, the object will return True, and so we need to check for this or no new handler will be created when re-registering
+        if handler and "RNA_HANDLE_REMOVED" in str(handler):
+            handler = hud_handlers[name] = None
+
+        if enabled and not handler:
+            hud_handlers[name] = bpy.types.SpaceView3D.draw_handler_add(*get_HUD_args(name), 'WINDOW', 'POST_PIXEL')
 
-    wm = bpy.context.window_manager
+        elif handler and not enabled:
+            bpy.types.SpaceView3D.draw_handler_remove(handler, 'WINDOW')
+            hud_handlers[name] = None
 
-    # if you unregister the addon, the handle will somehow stay arround as a capsule object with the following name
-    # despite that, the object will return True, and so we need to check for this or no new handler will be created when re-registering
-    if screencastHUD and "RNA_HANDLE_REMOVED" in str(screencastHUD):
-        screencastHUD = None
 
-    # if bpy.context.window_manager.operators and scene.M3.screen_cast:
-    if getattr(wm, 'M3_screen_cast', False):
-        if not screencastHUD:
-            screencastHUD = bpy.types.SpaceView3D.draw_handler_add(draw_screen_cast_HUD, (bpy.context, ), 'WINDOW', 'POST_PIXEL')
+def remove_HUDs():
+    for name, handler in hud_handlers.items():
+        if handler and "RNA_HANDLE_REMOVED" not in str(handler):
+            bpy.types.SpaceView3D.draw_handler_remove(handler, 'WINDOW')
 
-    elif screencastHUD:
-        bpy.types.SpaceView3D.draw_handler_remove(screencastHUD, 'WINDOW')
-        screencastHUD = None
+        hud_handlers[name] = None
+
+
+@persistent
+@profile('update_HUDs')
+def update_HUDs(scene, depsgraph=None):
+    update_HUD_state(scene, depsgraph)
+    sync_HUDs()
+
+    # have the object axes recomputed, if they are drawn and objects were transformed
+    if 'draw_object_axes' in bpy.app.driver_namespace:
+        if depsgraph is None or any(isinstance(update.id, bpy.types.Object) and update.is_updated_transform for update in depsgraph.updates):
+            tag_object_axes()
@@ -23,6 +23,7 @@ shift = ['LEFT_SHIFT', 'RIGHT_SHIFT']
 
 preferences_tabs = [("GENERAL", "General", ""),
                     ("KEYMAPS", "Keymaps", ""),
+                    ("DEVELOPER", "Developer", ""),
                     ("ABOUT", "About", "")]
 
 matcap_background_type_items = [("THEME", "Theme", ""),
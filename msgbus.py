@@ -1,20 +1,82 @@
 import bpy
 from . utils import registration as r
-from . utils.group import update_group_name
+from . utils.group import update_group_name, register_group_name
+from . utils.object import get_children
 
 
+# DISPATCH
+
+# notifications are collected per kind and deduped by the name of the object, that was active when they came in
+# a single timer then processes them all at once, so dragging the color picker doesn't re-sync a group's children on every notification
+debounce_interval = 0.05
+pending = {'name': set(),
+           'color': set()}
+
+
+def queue(kind, obj):
+    pending[kind].add(obj.name)
+
+    if not bpy.app.timers.is_registered(dispatch):
+        bpy.app.timers.register(dispatch, first_interval=debounce_interval)
+
+
+def dispatch():
+    names, pending['name'] = pending['name'], set()
+    colors, pending['color'] = pending['color'], set()
+
+    # objects may have been renamed again or removed in the meantime
+    for name in names:
+        obj = bpy.data.objects.get(name)
+
+        if obj and obj.M3.is_group_empty and r.get_prefs().group_auto_name:
+            update_group_name(obj)
+
+    for name in colors:
+        obj = bpy.data.objects.get(name)
+
+        if obj and obj.M3.is_group_empty:
+            sync_group_color(obj)
+
+    # returning None unregisters the timer
+    return None
+
+
+def clear_dispatch():
+    if bpy.app.timers.is_registered(dispatch):
+        bpy.app.timers.unregister(dispatch)
+
+    for kind in pending:
+        pending[kind].clear()
+
+
+def sync_group_color(group):
+    '''
+    write the group's color to all its child objects in one go, skipping the ones that already have it
+    '''
+
+    color = tuple(group.color)
+
+    for obj in get_children(group):
+        if obj.M3.is_group_object and not obj.M3.is_group_empty and tuple(obj.color) != color:
+            obj.color = color
+
+
+# NOTIFICATIONS
+
 def group_name_change():
     active = bpy.context.active_object
 
-    if active and active.M3.is_group_empty and r.get_prefs().group_auto_name:
-        update_group_name(active)
+    if active:
+
+        # keep the group name allocator aware of the new name, so it never hands it out again
+        register_group_name(active.name)
+
+        if active.M3.is_group_empty:
+            queue('name', active)
 
 
 def group_color_change():
     active = bpy.context.active_object
 
     if active and active.M3.is_group_empty:
-        objects = [obj for obj in active.children if obj.M3.is_group_object and not obj.M3.is_group_empty]
-
-        for obj in objects:
-            obj.color = active.color
+        queue('color', active)
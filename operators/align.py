@@ -3,7 +3,7 @@ from bpy.props import BoolProperty, EnumProperty, FloatProperty
 from mathutils import Matrix, Vector, Euler, Quaternion
 from math import radians
 from .. utils.math import get_loc_matrix, get_rot_matrix, get_sca_matrix, average_locations
-from .. utils.object import compensate_children
+from .. utils.object import compensate_children, get_children
 from .. items import obj_align_mode_items
 
 
@@ -127,7 +127,7 @@ class Align(bpy.types.Operator):
         if self.mode in ['ORIGIN', 'CURSOR', 'FLOOR']:
 
             # ignore all group objects if a group empty is the active object, so th group moves as once
-            if active and active.M3.is_group_empty and active.children:
+            if active and active.M3.is_group_empty and get_children(active):
                 sel = [active]
 
         # if there are group empties in the selection, select the top_level ones only!
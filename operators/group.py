@@ -1,6 +1,6 @@
 import bpy
 from bpy.props import EnumProperty, BoolProperty
-from .. utils.object import parent, unparent
+from .. utils.object import parent, unparent, get_children, invalidate_hierarchy
 from .. utils.group import group, ungroup, get_group_matrix, select_group_children, get_child_depth, clean_up_groups, fade_group_sizes
 from .. utils.collection import get_collection_depth
 from .. utils.registration import get_prefs
@@ -224,7 +224,7 @@ class UnGroup(bpy.types.Operator):
 
     def collect_entire_hierarchy(self, empties):
         for e in empties:
-            children = [obj for obj in e.children if obj.M3.is_group_empty]
+            children = [obj for obj in get_children(e) if obj.M3.is_group_empty]
 
             for c in children:
                 self.empties.append(c)
@@ -250,16 +250,17 @@ class Groupify(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == 'OBJECT':
-            return [obj for obj in context.selected_objects if obj.type == 'EMPTY' and not obj.M3.is_group_empty and obj.children]
+            return [obj for obj in context.selected_objects if obj.type == 'EMPTY' and not obj.M3.is_group_empty and get_children(obj)]
 
     def execute(self, context):
-        all_empties = [obj for obj in context.selected_objects if obj.type == 'EMPTY' and not obj.M3.is_group_empty and obj.children]
+        all_empties = [obj for obj in context.selected_objects if obj.type == 'EMPTY' and not obj.M3.is_group_empty and get_children(obj)]
 
         # only take the top level empties
         empties = [e for e in all_empties if e.parent not in all_empties]
 
         # groupify all the way down
         self.groupify(empties)
+        invalidate_hierarchy()
 
         # fade group sizes
         if get_prefs().group_fade_sizes:
@@ -269,7 +270,7 @@ class Groupify(bpy.types.Operator):
 
     def groupify(self, objects):
         for obj in objects:
-            if obj.type == 'EMPTY' and not obj.M3.is_group_empty and obj.children:
+            if obj.type == 'EMPTY' and not obj.M3.is_group_empty and get_children(obj):
                 obj.M3.is_group_empty = True
                 obj.M3.is_group_object = True if obj.parent and obj.parent.M3.is_group_empty else False
                 obj.show_in_front = True
@@ -281,7 +282,7 @@ class Groupify(bpy.types.Operator):
                     obj.name = f"{obj.name}_GROUP"
 
                 # do it all the way down
-                self.groupify(obj.children)
+                self.groupify(get_children(obj))
 
             else:
                 obj.M3.is_group_object = True
@@ -292,15 +293,15 @@ class Groupify(bpy.types.Operator):
 class Select(bpy.types.Operator):
     bl_idname = "machin3.select_group"
     bl_label = "MACHIN3: Select Group"
-    bl_description = "Select Group\nCTRL: Select entire Group Hierarchy down"
+    bl_description = "Select Group\nCTRL: Select entire Group Hierarchy down\nALT: Repair all Groups in the Scene"
     bl_options = {'REGISTER', 'UNDO'}
 
     @classmethod
     def description(cls, context, properties):
         if context.scene.M3.group_recursive_select:
-            return "Select entire Group Hierarchies down"
+            return "Select entire Group Hierarchies down\nALT: Repair all Groups in the Scene"
         else:
-            return "Select Top Level Groups\nCTRL: Select entire Group Hierarchy down"
+            return "Select Top Level Groups\nCTRL: Select entire Group Hierarchy down\nALT: Repair all Groups in the Scene"
 
     @classmethod
     def poll(cls, context):
@@ -309,8 +310,8 @@ class Select(bpy.types.Operator):
 
     def invoke(self, context, event):
 
-        # cleanup all groups initially
-        clean_up_groups(context)
+        # cleanup the changed groups initially, or all of them, when repairing
+        clean_up_groups(context, full=event.alt)
 
         empties = {obj for obj in context.selected_objects if obj.M3.is_group_empty}
         objects = [obj for obj in context.selected_objects if obj.M3.is_group_object and obj not in empties]
@@ -430,7 +431,7 @@ class Add(bpy.types.Operator):
                 return {'CANCELLED'}
 
         # get the addable objects, all objects that aren't the active group or among its direct children, so including selected objects of other groups, but not those children whose parents are also selected, bc you want to keeps those hierarchies
-        objects = [obj for obj in context.selected_objects if obj != active_group and obj not in active_group.children and (not obj.parent or (obj.parent and obj.parent.M3.is_group_empty and not obj.parent.select_get()))]
+        objects = [obj for obj in context.selected_objects if obj != active_group and obj not in get_children(active_group) and (not obj.parent or (obj.parent and obj.parent.M3.is_group_empty and not obj.parent.select_get()))]
 
         if debug:
             print("active group", active_group.name)
@@ -440,7 +441,7 @@ class Add(bpy.types.Operator):
 
             # existing mesh object children, before any new objects are added (ignore stashes, by checking presence in view_layer)
             # NOTE: it's not quite clear how stashes can become group objects, so this needs to be investigaed and prevented
-            children = [c for c in active_group.children if c.M3.is_group_object and c.type == 'MESH' and c.name in context.view_layer.objects]
+            children = [c for c in get_children(active_group) if c.M3.is_group_object and c.type == 'MESH' and c.name in context.view_layer.objects]
 
             # set prop to determine how whether add_mirror is drawn
             self.is_mirror = any(obj for obj in children for mod in obj.modifiers if mod.type == 'MIRROR')
@@ -472,7 +473,7 @@ class Add(bpy.types.Operator):
             if self.realign_group_empty:
 
                 # get the new group empties matrix
-                gmx = get_group_matrix(context, [c for c in active_group.children], self.location, self.rotation)
+                gmx = get_group_matrix(context, get_children(active_group), self.location, self.rotation)
 
                 # compensate the children location, so they stay in place
                 compensate_children(active_group, active_group.matrix_world, gmx)
@@ -600,7 +601,7 @@ class Remove(bpy.types.Operator):
             # optionally re-align the goup empty
             if self.realign_group_empty:
                 for e in empties:
-                    children = [c for c in e.children]
+                    children = get_children(e)
 
                     if children:
                         gmx = get_group_matrix(context, children, self.location, self.rotation)
@@ -692,7 +693,7 @@ class CollapseOutliner(bpy.types.Operator):
         # print("collection depth", col_depth)
 
         # get child depth
-        child_depth = get_child_depth(self, [obj for obj in context.scene.objects if obj.children], init=True)
+        child_depth = get_child_depth(self, [obj for obj in context.scene.objects if get_children(obj)], init=True)
         # print("child depth", child_depth)
 
         # collapse the max amount of the two, plus once more, in case meshes are expanded too
@@ -4,6 +4,7 @@ from bl_ui.space_statusbar import STATUSBAR_HT_header as statusbar
 from mathutils import Vector
 from .. utils.raycast import cast_obj_ray_from_mouse, cast_bvh_ray_from_mouse
 from .. utils.draw import draw_label
+from .. utils.developer import profile
 from .. utils.registration import get_prefs
 
 
@@ -38,6 +39,7 @@ class MaterialPicker(bpy.types.Operator):
     def poll(cls, context):
         return context.area.type == 'VIEW_3D'
 
+    @profile('MaterialPicker.draw_HUD')
     def draw_HUD(self, args):
         context, event = args
 
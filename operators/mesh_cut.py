@@ -1,45 +1,103 @@
 import bpy
 import bmesh
+from mathutils import Vector
 from math import degrees
-from .. utils.mesh import unhide_deselect, join
+import numpy as np
+import time
+from .. utils.mesh import set_mesh_states, get_mesh_arrays, join_mesh_arrays, join_bmesh, has_extra_mesh_data
 from .. utils.object import flatten
 
 
 class MeshCut(bpy.types.Operator):
     bl_idname = "machin3.mesh_cut"
     bl_label = "MACHIN3: Mesh Cut"
-    bl_description = "Knife Intersect a mesh, using another object.\nALT: flatten target object's modifier stack\nSHIFT: Mark Seam"
+    bl_description = "Knife Intersect a mesh, using another object.\nWith 2 objects selected, the active object is cut\nWith more than 2 objects selected, the active object cuts all other selected ones\nALT: flatten target object's modifier stack\nSHIFT: Mark Seam"
     bl_options = {'REGISTER', 'UNDO'}
 
     @classmethod
     def poll(cls, context):
-        return context.mode == 'OBJECT' and len(context.selected_objects) == 2 and context.active_object and context.active_object in context.selected_objects and all(obj.type == 'MESH' for obj in context.selected_objects)
+        return context.mode == 'OBJECT' and len(context.selected_objects) >= 2 and context.active_object and context.active_object in context.selected_objects and all(obj.type == 'MESH' for obj in context.selected_objects)
 
     def invoke(self, context, event):
-        target = context.active_object
-        cutter = [obj for obj in context.selected_objects if obj != target][0]
 
-        # unhide both
-        unhide_deselect(target.data)
-        unhide_deselect(cutter.data)
+        # single cut, the active is the target
+        if len(context.selected_objects) == 2:
+            target = context.active_object
+            cutter = [obj for obj in context.selected_objects if obj != target][0]
+            targets = [target]
+
+        # batch cut, the active is the cutter
+        else:
+            cutter = context.active_object
+
+            # linked duplicates share a mesh, which should only be cut once, and not at all if it's the cutter's mesh
+            meshes = {cutter.data}
+            targets = []
+
+            for obj in context.selected_objects:
+                if obj != cutter and obj.data not in meshes:
+                    meshes.add(obj.data)
+                    targets.append(obj)
 
         # get depsgraph
         dg = context.evaluated_depsgraph_get()
 
-        # flatten the cutter
+        # check the evaluated cutter first, so nothing is changed, if the cut is cancelled, which doesn't push an undo step
+        cutter_bbox = get_evaluated_world_bbox(cutter, dg)
+
+        if cutter_bbox is None:
+            self.report({'INFO'}, "Cutter has no geometry")
+            return {'CANCELLED'}
+
+        # skip targets, whose bounding boxes don't overlap the cutter's
+        targets = [obj for obj in targets if bboxes_overlap(cutter_bbox, get_world_bbox([Vector(co) for co in obj.bound_box], obj.matrix_world))]
+
+        if not targets:
+            self.report({'INFO'}, "Cutter doesn't overlap any target")
+            return {'CANCELLED'}
+
+        # unhide both
+        set_mesh_states([cutter.data] + [obj.data for obj in targets], hide=False, select=False)
+
+        # re-fetch the depsgraph, so the flattened meshes are unhidden too
+        dg = context.evaluated_depsgraph_get()
+
+        # flatten the cutter, clear its materials, and cache its mesh arrays, so it's only done once, no matter how many targets there are
         flatten(cutter, dg)
+        cutter.data.materials.clear()
 
-        # flatten the target
+        cutter_arrays = get_mesh_arrays(cutter.data, normals=True)
+        cutter_mx = cutter.matrix_world.copy()
+
+        timings = {obj.name: 0 for obj in targets}
+
+        # flatten the target(s)
         if event.alt:
-            flatten(target, dg)
+            for target in targets:
+                flatten(target, dg)
 
-        # clear cutter materials
-        cutter.data.materials.clear()
+        # join the cached cutter into each target
+        for target in targets:
+            start = time.perf_counter()
+
+            self.join_cutter(target, cutter, cutter_arrays, cutter_mx)
+
+            timings[target.name] += time.perf_counter() - start
+
+        # the cutter object is removed with its mesh
+        bpy.data.meshes.remove(cutter.data, do_unlink=True)
+
+        # knife intersect all targets in a single edit mode session
+        for obj in context.selected_objects:
+            obj.select_set(False)
 
-        # join target and cutter
-        join(target, [cutter], select=[1])
+        for target in targets:
+            target.select_set(True)
+
+        context.view_layer.objects.active = targets[0]
+
+        start = time.perf_counter()
 
-        # knife intersect
         bpy.ops.object.mode_set(mode='EDIT')
         if event.shift:
             bpy.ops.mesh.intersect(separate_mode='ALL')
@@ -47,20 +105,66 @@ class MeshCut(bpy.types.Operator):
             bpy.ops.mesh.intersect(separate_mode='CUT')
         bpy.ops.object.mode_set(mode='OBJECT')
 
+        intersect_time = time.perf_counter() - start
+
         # remove cutter
+        for target in targets:
+            start = time.perf_counter()
+
+            self.remove_cutter(target, seam=event.shift)
+
+            timings[target.name] += time.perf_counter() - start
+
+        if len(targets) > 1:
+            print(f"\nMeshCut: cut {len(targets)} targets, intersect took {intersect_time:.6f}s")
+
+            for name, t in timings.items():
+                print(f" {name}: {t:.6f}s")
+
+            self.report({'INFO'}, f"Cut {len(targets)} objects in {intersect_time + sum(timings.values()):.2f}s")
+
+        return {'FINISHED'}
+
+    def join_cutter(self, target, cutter, cutter_arrays, cutter_mx):
+        '''
+        join the cached cutter arrays into the target, or a temporary copy of the cutter mesh, if the target has shape keys, vertex groups or generic attributes
+        '''
+
+        if cutter.data.use_auto_smooth:
+            target.data.use_auto_smooth = True
+
+        if target.data.shape_keys or has_extra_mesh_data(target.data, [target], normals=False):
+            temp = bpy.data.objects.new(name="MeshCut", object_data=cutter.data.copy())
+            temp.matrix_world = cutter_mx
+
+            # join_bmesh() removes the temp object's mesh, and with it the object, so it can't be accessed afterwards
+            name = temp.name
+
+            join_bmesh(target, [temp], select=[1])
+
+            temp = bpy.data.objects.get(name)
+
+            if temp:
+                bpy.data.objects.remove(temp, do_unlink=True)
+
+        else:
+            custom_normals = target.data.has_custom_normals or cutter.data.has_custom_normals
+            join_mesh_arrays(target, [(cutter_arrays, target.matrix_world.inverted_safe() @ cutter_mx)], select=[1], custom_normals=custom_normals)
+
+    def remove_cutter(self, target, seam=False):
         bm = bmesh.new()
         bm.from_mesh(target.data)
         bm.normal_update()
         bm.verts.ensure_lookup_table()
 
-        i = bm.faces.layers.int.verify()
+        i = bm.faces.layers.int.get('M3_source')
         s = bm.edges.layers.string.verify()
 
         cutter_faces = [f for f in bm.faces if f[i] > 0]
         bmesh.ops.delete(bm, geom=cutter_faces, context='FACES')
 
         # mark seams
-        if event.shift:
+        if seam:
             non_manifold = [e for e in bm.edges if not e.is_manifold]
 
             # mark them and collect the verts as well
@@ -100,4 +204,33 @@ class MeshCut(bpy.types.Operator):
         bm.to_mesh(target.data)
         bm.clear()
 
-        return {'FINISHED'}
+
+def get_world_bbox(coords, mx):
+    '''
+    return world space min and max corners of the passed in local coords
+    '''
+
+    mx = np.array(mx, dtype=np.float32)
+    coords = np.array(coords, dtype=np.float32).reshape(-1, 3) @ mx[:3, :3].T + mx[:3, 3]
+
+    return coords.min(axis=0), coords.max(axis=0)
+
+
+def get_evaluated_world_bbox(obj, depsgraph):
+    '''
+    return world space min and max corners of the evaluated object's mesh, or None if it has no geometry
+    '''
+
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+
+    obj_eval.to_mesh_clear()
+
+    return get_world_bbox(coords, obj.matrix_world) if len(coords) else None
+
+
+def bboxes_overlap(bbox1, bbox2):
+    return bool(np.all(bbox1[0] <= bbox2[1]) and np.all(bbox2[0] <= bbox1[1]))
@@ -1,7 +1,12 @@
 import bpy
 from bpy.props import IntProperty, BoolProperty
 from bpy_extras.object_utils import AddObjectHelper
+import bmesh
+from mathutils import Matrix
 from math import radians
+import numpy as np
+from .. utils.geometry import calculate_quadsphere
+from .. utils.mesh import get_mesh_from_arrays
 
 
 class QuadSphere(bpy.types.Operator):
@@ -12,6 +17,7 @@ class QuadSphere(bpy.types.Operator):
 
     subdivisions: IntProperty(name='Subdivisions', default=4, min=1, max=8)
     shade_smooth: BoolProperty(name="Shade Smooth", default=True)
+    equal_area: BoolProperty(name="Equal Area", description="Spread the Vertices more evenly, instead of bunching them up at the Cube Corners", default=False)
 
     align_rotation: BoolProperty(name="Align Rotation", default=True)
 
@@ -23,6 +29,7 @@ class QuadSphere(bpy.types.Operator):
         row = column.row(align=True)
         row.prop(self, "subdivisions")
         row.prop(self, "shade_smooth", toggle=True)
+        row.prop(self, "equal_area", toggle=True)
         row.prop(self, "align_rotation", toggle=True)
 
     @classmethod
@@ -30,30 +37,49 @@ class QuadSphere(bpy.types.Operator):
         return context.mode in ['OBJECT', 'EDIT_MESH']
 
     def execute(self, context):
-        bpy.ops.mesh.primitive_cube_add(align='CURSOR' if self.align_rotation else 'WORLD')
+        cursor = context.scene.cursor
+        cmx = cursor.matrix if self.align_rotation else Matrix.Translation(cursor.location)
 
-        mode = bpy.context.mode
+        # create the spherified cube analytically, instead of subdividing and spherifying a cube repeatedly
+        coords, loop_verts, loop_totals = calculate_quadsphere(subdivisions=self.subdivisions, equal_area=self.equal_area)
 
-        if mode == 'OBJECT':
-            bpy.ops.object.mode_set(mode='EDIT')
+        if context.mode == 'OBJECT':
+            mesh = get_mesh_from_arrays("Quadsphere", coords, loop_verts, loop_totals, smooth=self.shade_smooth)
+            mesh.auto_smooth_angle = radians(60)
 
-        if self.shade_smooth:
-            bpy.ops.mesh.faces_shade_smooth()
+            quadsphere = bpy.data.objects.new(name="Quadsphere", object_data=mesh)
+            quadsphere.matrix_world = cmx
+            context.collection.objects.link(quadsphere)
 
-        for sub in range(self.subdivisions):
-            bpy.ops.mesh.subdivide(number_cuts=1, smoothness=1)
-            bpy.ops.transform.tosphere(value=1)
+            for obj in context.selected_objects:
+                obj.select_set(False)
 
-        if mode == 'OBJECT':
-            bpy.ops.object.mode_set(mode='OBJECT')
+            quadsphere.select_set(True)
+            context.view_layer.objects.active = quadsphere
 
-        quadsphere = context.active_object
-        quadsphere.data.auto_smooth_angle = radians(60)
+        else:
+            active = context.active_object
 
-        # clear uvs
-        mesh = quadsphere.data
+            # bring the coords into the local space of the edit mesh object
+            mx = np.array(active.matrix_world.inverted_safe() @ cmx)
+            coords = coords @ mx[:3, :3].T + mx[:3, 3]
 
-        while mesh.uv_layers:
-            mesh.uv_layers.remove(mesh.uv_layers[0])
+            # like primitive_cube_add, only the new geometry will be selected
+            bpy.ops.mesh.select_all(action='DESELECT')
+
+            mesh = get_mesh_from_arrays("Quadsphere", coords, loop_verts, loop_totals, smooth=self.shade_smooth)
+            mesh.polygons.foreach_set('select', np.ones(len(loop_totals), dtype=bool))
+            mesh.edges.foreach_set('select', np.ones(len(mesh.edges), dtype=bool))
+            mesh.vertices.foreach_set('select', np.ones(len(coords), dtype=bool))
+
+            bm = bmesh.from_edit_mesh(active.data)
+            bm.from_mesh(mesh)
+            bm.select_flush(True)
+
+            bmesh.update_edit_mesh(active.data)
+
+            bpy.data.meshes.remove(mesh, do_unlink=True)
+
+            active.data.auto_smooth_angle = radians(60)
 
         return {'FINISHED'}
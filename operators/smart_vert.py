@@ -8,6 +8,7 @@ from mathutils.geometry import intersect_point_line, intersect_line_line, inters
 from .. utils.graph import get_shortest_path
 from .. utils.ui import popup_message
 from .. utils.draw import draw_line, draw_lines, draw_point, draw_tris, draw_vector
+from .. utils.developer import profile
 from .. utils.snap import Snap
 from .. utils.math import average_locations, get_center_between_verts, get_face_center
 from .. utils.selection import get_edges_vert_sequences, get_selection_islands
@@ -115,6 +116,7 @@ class SmartVert(bpy.types.Operator):
                 r = row.row()
                 r.prop(self, "pathtype", expand=True)
 
+    @profile('SmartVert.draw_VIEW3D')
     def draw_VIEW3D(self):
 
         # draw slide vectors
@@ -2,10 +2,16 @@ import bpy
 from bpy.props import IntProperty, FloatProperty, BoolProperty
 import bmesh
 from mathutils import Vector, Matrix
+import numpy as np
 from .. utils.selection import get_boundary_edges, get_edges_vert_sequences
 from .. utils.math import average_locations
-from .. utils.geometry import calculate_thread
+from .. utils.geometry import get_thread_arrays
 from .. utils.draw import draw_vector
+from .. utils.mesh import get_mesh_from_arrays
+
+
+# boundary sequences of recent selections, as vert indices, keyed by object, selection and selection coords
+sequence_cache = {}
 
 
 class Thread(bpy.types.Operator):
@@ -63,19 +69,19 @@ class Thread(bpy.types.Operator):
         selfaces = [f for f in bm.faces if f.select]
 
         if selfaces:
-            boundary = get_boundary_edges(selfaces)
-            sequences = get_edges_vert_sequences(selverts, boundary, debug=False)
+            sequences = self.get_sequences(active, bm, selverts, selfaces)
 
             # if there are 2 sequences
             if len(sequences) == 2:
                 seq1, seq2 = sequences
 
-                verts1, cyclic1 = seq1
-                verts2, cyclic2 = seq2
+                verts1, cyclic1, center1 = seq1
+                verts2, cyclic2, center2 = seq2
 
                 if self.flip:
                     verts1, verts2 = verts2, verts1
                     cyclic1, cyclic2 = cyclic2, cyclic1
+                    center1, center2 = center2, center1
 
 
                 # if they are both cyclic and have the same amount of verts,and at least 5
@@ -94,22 +100,18 @@ class Thread(bpy.types.Operator):
                     # set amount of segments
                     self.segments = len(verts1)
 
-                    # get selection mid points
-                    center1 = average_locations([v.co for v in verts1])
-                    center2 = average_locations([v.co for v in verts2])
-
                     # get the radii, and set the radius as an average
                     radius1 = (center1 - verts1[0].co).length
                     radius2 = (center2 - verts2[0].co).length
                     self.radius = (radius1 + radius2) / 2
 
                     # create point coordinates and face indices
-                    thread, bottom, top, height = calculate_thread(segments=self.segments, loops=self.loops, radius=self.radius, depth=self.depth / 100, h1=self.h1, h2=self.h2, h3=self.h3, h4=self.h4, fade=self.fade / 100)
+                    coords, loop_verts, loop_totals, sharp_edges, height = get_thread_arrays(segments=self.segments, loops=self.loops, radius=self.radius, depth=self.depth / 100, h1=self.h1, h2=self.h2, h3=self.h3, h4=self.h4, fade=self.fade / 100)
 
                     if height != 0:
 
                         # build the faces from those coords and indices
-                        verts, faces = self.build_faces(bm, thread, bottom, top, smooth=smooth)
+                        verts, faces = self.build_faces(bm, coords, loop_verts, loop_totals, sharp_edges, smooth=smooth)
 
                         # scale the thread geometry to fit the selection height
                         selheight = (center1 - center2).length
@@ -154,65 +156,75 @@ class Thread(bpy.types.Operator):
                     return {'FINISHED'}
         return {'CANCELLED'}
 
-    def build_faces(self, bm, thread, bottom, top, smooth=False):
-        verts = []
+    def get_sequences(self, active, bm, selverts, selfaces):
+        '''
+        get the boundary vert sequences of the selection and their centers
+        the result is cached as vert indices, so re-executing the operator from the redo panel, doesn't have to analyse the same selection again
+        '''
+
+        bm.verts.index_update()
+        bm.faces.index_update()
+
+        key = (active.name, len(bm.verts), len(bm.faces), tuple(f.index for f in selfaces), tuple(tuple(v.co) for v in selverts))
+
+        if key in sequence_cache:
+            bm.verts.ensure_lookup_table()
+            return [([bm.verts[idx] for idx in indices], cyclic, center.copy()) for indices, cyclic, center in sequence_cache[key]]
+
+        boundary = get_boundary_edges(selfaces)
+        sequences = [(verts, cyclic, average_locations([v.co for v in verts])) for verts, cyclic in get_edges_vert_sequences(selverts, boundary, debug=False)]
+
+        # only the last few selections are kept around
+        if len(sequence_cache) >= 8:
+            sequence_cache.pop(next(iter(sequence_cache)))
+
+        sequence_cache[key] = [([v.index for v in verts], cyclic, center) for verts, cyclic, center in sequences]
 
-        for co in thread[0]:
-            v = bm.verts.new(co)
-            verts.append(v)
+        return sequences
 
-        faces = []
+    def build_faces(self, bm, coords, loop_verts, loop_totals, sharp_edges, smooth=False):
+        '''
+        create all thread verts and faces in bulk, by building a temporary mesh from the arrays, and appending it to the bmesh
+        the verts and faces are tagged with an int layer, so they can be fetched - in order - from the bmesh afterwards
+        '''
 
-        for ids in thread[1]:
-            f = bm.faces.new([verts[idx] for idx in ids])
-            f.smooth = smooth
-            faces.append(f)
+        vert_count = len(coords)
+        face_count = len(loop_totals)
 
-            if smooth:
-                f.edges[0].smooth = False
-                f.edges[-2].smooth = False
+        mesh = get_mesh_from_arrays("Thread", coords, loop_verts, loop_totals, smooth=smooth)
 
-        bottom_verts = []
+        # mark the sharp edges, by matching their sorted vertex index pairs against the ones of the mesh edges
+        if smooth:
+            edge_verts = np.empty((len(mesh.edges), 2), dtype=np.int32)
+            mesh.edges.foreach_get('vertices', edge_verts.reshape(-1))
 
-        for co in bottom[0]:
-            v = bm.verts.new(co)
-            bottom_verts.append(v)
+            edge_keys = np.sort(edge_verts, axis=1).astype(np.int64)
+            sharp_keys = np.sort(sharp_edges, axis=1).astype(np.int64)
 
-        bottom_faces = []
+            sharp = np.isin(edge_keys[:, 0] * vert_count + edge_keys[:, 1], sharp_keys[:, 0] * vert_count + sharp_keys[:, 1])
+            mesh.edges.foreach_set('use_edge_sharp', sharp)
 
-        for ids in bottom[1]:
-            f = bm.faces.new([bottom_verts[idx] for idx in ids])
-            f.smooth = smooth
-            bottom_faces.append(f)
+        vert_ids = mesh.attributes.new('M3_thread_vert', 'INT', 'POINT')
+        vert_ids.data.foreach_set('value', np.arange(1, vert_count + 1, dtype=np.int32))
 
-            if smooth:
-                if len(ids) == 4:
-                    f.edges[-2].smooth = False
-                    f.edges[0].smooth = False
-                else:
-                    f.edges[-1].smooth = False
-                    f.edges[1].smooth = False
+        face_ids = mesh.attributes.new('M3_thread_face', 'INT', 'FACE')
+        face_ids.data.foreach_set('value', np.ones(face_count, dtype=np.int32))
 
+        bm.from_mesh(mesh)
+        bpy.data.meshes.remove(mesh, do_unlink=True)
 
-        top_verts = []
+        vl = bm.verts.layers.int.get('M3_thread_vert')
+        fl = bm.faces.layers.int.get('M3_thread_face')
 
-        for co in top[0]:
-            v = bm.verts.new(co)
-            top_verts.append(v)
+        verts = [None] * vert_count
 
-        top_faces = []
+        for v in bm.verts:
+            if v[vl]:
+                verts[v[vl] - 1] = v
 
-        for ids in top[1]:
-            f = bm.faces.new([top_verts[idx] for idx in ids])
-            f.smooth = smooth
-            top_faces.append(f)
+        faces = [f for f in bm.faces if f[fl]]
 
-            if smooth:
-                if len(ids) == 4:
-                    f.edges[-2].smooth = False
-                    f.edges[0].smooth = False
-                else:
-                    f.edges[-1].smooth = False
-                    f.edges[1].smooth = False
+        bm.verts.layers.int.remove(vl)
+        bm.faces.layers.int.remove(fl)
 
-        return [v for v in verts + bottom_verts + top_verts if v.is_valid], faces + bottom_faces + top_faces
+        return verts, faces
@@ -5,6 +5,8 @@ from . properties import AppendMatsCollection
 from . utils.ui import get_icon, draw_keymap_items
 from . utils.registration import activate, get_path, get_name, get_addon
 from . items import preferences_tabs, matcap_background_type_items
+from . utils.developer import set_profiling, get_profile_stats, profile_ring_size
+from . utils.group import get_group_polls_stats
 
 
 decalmachine = None
@@ -91,6 +93,12 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
             self.dirty_keymaps = False
 
 
+    # DEVELOPER
+
+    def update_profiling(self, context):
+        set_profiling(self.profiling)
+
+
     # RUNTIME TOOL ACTIVATION
 
     def update_activate_smart_vert(self, context):
@@ -330,6 +338,14 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
     HUD_fade_tools_pie: FloatProperty(name="Tools Pie HUD Fade Time (seconds)", default=0.75, min=0.1)
 
 
+    # DEVELOPER
+
+    profiling: BoolProperty(name="Profile Handlers and HUDs", description="Record the Timings of MACHIN3tools' Handlers, Draw Callbacks and modal HUDs", default=False, update=update_profiling)
+    defer_registration: BoolProperty(name="Defer Registration", description="Register Tools and Pies once Blender has started, instead of during Startup\nThis moves the Registration Work after Startup, it doesn't reduce it\nTakes effect on the next Blender start", default=False)
+    warm_up_icons: BoolProperty(name="Warm up Icons", description="Load all Icons in the Background, shortly after Startup, instead of when they are first drawn", default=False)
+    benchmark_registration: BoolProperty(name="Benchmark Registration", description="Print Import and Registration Times per Module to the System Console, when Tools and Pies are registered", default=False)
+
+
     # hidden
 
     tabs: EnumProperty(name="Tabs", items=preferences_tabs, default="GENERAL")
@@ -355,6 +371,9 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
         elif self.tabs == "KEYMAPS":
             self.draw_keymaps(box)
 
+        elif self.tabs == "DEVELOPER":
+            self.draw_developer(box)
+
         elif self.tabs == "ABOUT":
             self.draw_about(box)
 
@@ -890,6 +909,48 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
         if not self.draw_pie_keymaps(kc, keys, b):
             b.label(text="No keymappings created, because none of the pies have been activated.")
 
+    def draw_developer(self, box):
+        column = box.column()
+
+        row = column.row(align=True)
+        row.prop(self, "profiling", toggle=True)
+        row.operator("machin3.reset_profiles", text="Reset", icon='LOOP_BACK')
+        row.operator("machin3.export_profiles", text="Export JSON", icon='EXPORT')
+
+        row = column.row(align=True)
+        row.prop(self, "defer_registration", toggle=True)
+        row.prop(self, "warm_up_icons", toggle=True)
+        row.prop(self, "benchmark_registration", toggle=True)
+
+        stats = get_profile_stats()
+
+        if stats:
+            column.separator()
+
+            b = column.box()
+            b.label(text=f"Timings in ms, Percentiles and Max of the last {profile_ring_size} Calls")
+
+            col = b.column(align=True)
+
+            for s in [{'name': 'Name', 'calls': 'Calls', 'total': 'Total', 'mean': 'Mean', 'p50': 'P50', 'p95': 'P95', 'p99': 'P99', 'max': 'Max'}] + stats:
+                split = col.split(factor=0.3)
+                split.label(text=s['name'])
+
+                row = split.row()
+                row.label(text=str(s['calls']))
+
+                for key in ['total', 'mean', 'p50', 'p95', 'p99', 'max']:
+                    row.label(text=s[key] if isinstance(s[key], str) else f"{s[key]:.3f}")
+
+        elif not self.profiling:
+            column.label(text="Enable Profiling, then use Blender as usual, to record Timings", icon='INFO')
+
+        hits, misses, rate = get_group_polls_stats()
+
+        if hits + misses:
+            column.separator()
+            column.label(text=f"Group Polls Cache: {hits} Hits, {misses} Misses, {rate * 100:.1f}% Hit Rate")
+
     def draw_about(self, box):
         global decalmachine, meshmachine
 
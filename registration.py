@@ -9,6 +9,8 @@ classes = {'CORE': [('ui.UILists', [('AppendMatsUIList', '')]),
                     ('preferences', [('MACHIN3toolsPreferences', '')]),
                     ('ui.operators.call_pie', [('CallMACHIN3toolsPie', 'call_machin3tools_pie')]),
                     ('ui.operators.draw', [('DrawLabel', 'draw_label')]),
+                    ('ui.operators.profiling', [('ResetProfiles', 'reset_profiles'),
+                                                ('ExportProfiles', 'export_profiles')]),
                     ('ui.panels', [('PanelMACHIN3tools', 'machin3_tools')]),
                     ('ui.menus', [('MenuMACHIN3toolsObjectContextMenu', 'machin3tools_object_context_menu'),
                                   ('MenuMACHIN3toolsMeshContextMenu', 'machin3tools_mesh_context_menu'),
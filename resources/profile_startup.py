@@ -0,0 +1,47 @@
+'''
+headless MACHIN3tools startup profiling, to track registration times across releases
+
+    blender -b --factory-startup --python path/to/MACHIN3tools/resources/profile_startup.py -- --runs 5
+
+the addon is enabled and disabled again for the passed in number of runs, the first one being the cold start
+each registration prints its timing tree, and is added to startup_profiles.json in Blender's user config folder
+'''
+
+import bpy
+import addon_utils
+import os
+import sys
+import time
+
+
+argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+runs = int(argv[argv.index('--runs') + 1]) if '--runs' in argv else 1
+
+# import the addon from the folder this script is in, even if it's not installed
+path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+module = os.path.basename(path)
+
+sys.path.insert(0, os.path.dirname(path))
+
+# makes the addon print and persist its registration profile
+os.environ['MACHIN3TOOLS_PROFILE_STARTUP'] = '1'
+
+print(f"\nProfiling {module} startup in Blender {bpy.app.version_string}, {runs} {'run' if runs == 1 else 'runs'}")
+
+timings = []
+
+for run in range(runs):
+    start = time.perf_counter()
+
+    addon_utils.enable(module, default_set=True)
+
+    timings.append(time.perf_counter() - start)
+
+    addon_utils.disable(module, default_set=True)
+
+    print(f"\nrun {run + 1}: enabled in {timings[-1] * 1000:.2f}ms")
+
+print(f"\ncold start: {timings[0] * 1000:.2f}ms")
+
+if len(timings) > 1:
+    print(f"warm average: {sum(timings[1:]) / len(timings[1:]) * 1000:.2f}ms")
@@ -3,6 +3,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty
 import random
 from ... utils.registration import get_addon
 from ... utils.material import get_last_node, lighten_color
+from ... utils.object import get_children
 from ... colors import group_colors
 
 
@@ -241,7 +242,7 @@ class ColorizeObjectsFromGroups(bpy.types.Operator):
         return {'FINISHED'}
 
     def colorize_group(self, empty, recursive=False):
-        children = [c for c in empty.children if c.M3.is_group_object]
+        children = [c for c in get_children(empty) if c.M3.is_group_object]
 
         color = self.get_random_color() if self.random_color else empty.color
 
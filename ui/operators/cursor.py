@@ -8,7 +8,7 @@ from ... utils.ui import popup_message
 from ... utils.registration import get_prefs, get_addon
 from ... utils.draw import add_object_axes_drawing_handler, remove_object_axes_drawing_handler
 from ... utils.tools import get_active_tool
-from ... utils.object import compensate_children
+from ... utils.object import compensate_children, get_children
 
 
 cursor = None
@@ -208,7 +208,7 @@ class SelectedToCursor(bpy.types.Operator):
         sel = context.selected_objects
 
         # if the active object is a group empty, ignore all other selected objects
-        if context.active_object and context.active_object.M3.is_group_empty and context.active_object.children:
+        if context.active_object and context.active_object.M3.is_group_empty and get_children(context.active_object):
             sel = [context.active_object]
 
         # add active to selection if if isn't part of it
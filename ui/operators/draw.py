@@ -1,6 +1,7 @@
 import bpy
 from bpy.props import FloatProperty, StringProperty, FloatVectorProperty, BoolProperty
 from ... utils.draw import draw_label
+from ... utils.developer import profile
 
 
 class DrawLabel(bpy.types.Operator):
@@ -21,6 +22,7 @@ class DrawLabel(bpy.types.Operator):
     def poll(cls, context):
         return context.space_data.type == 'VIEW_3D'
 
+    @profile('DrawLabel.draw_HUD')
     def draw_HUD(self, context):
         alpha = self.countdown / self.time * self.alpha
         draw_label(context, title=self.text, coords=self.coords, center=self.center, color=self.color, alpha=alpha)
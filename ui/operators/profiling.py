@@ -0,0 +1,49 @@
+import bpy
+from bpy.props import StringProperty
+import os
+from ... utils.developer import reset_profiles, export_profiles, profiles
+
+
+class ResetProfiles(bpy.types.Operator):
+    bl_idname = "machin3.reset_profiles"
+    bl_label = "MACHIN3: Reset Profiles"
+    bl_description = "Clear all recorded Handler, Draw Callback and HUD Timings"
+    bl_options = {'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return profiles
+
+    def execute(self, context):
+        reset_profiles()
+        return {'FINISHED'}
+
+
+class ExportProfiles(bpy.types.Operator):
+    bl_idname = "machin3.export_profiles"
+    bl_label = "MACHIN3: Export Profiles"
+    bl_description = "Export the recorded Handler, Draw Callback and HUD Timings as JSON"
+    bl_options = {'INTERNAL'}
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return profiles
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = os.path.join(os.path.dirname(bpy.data.filepath) if bpy.data.filepath else os.path.expanduser('~'), "MACHIN3tools_profiles.json")
+
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        if not self.filepath.lower().endswith('.json'):
+            self.filepath += '.json'
+
+        path = export_profiles(bpy.path.abspath(self.filepath))
+
+        self.report({'INFO'}, f"Exported Profiles to {path}")
+        return {'FINISHED'}
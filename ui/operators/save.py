@@ -7,6 +7,7 @@ from ... utils.registration import get_prefs, get_addon
 from ... utils.append import append_material, append_world
 from ... utils.system import add_path_to_recent_files, get_incremented_paths
 from ... utils.ui import popup_message, get_icon
+from ... handlers import update_HUDs
 
 
 class New(bpy.types.Operator):
@@ -528,8 +529,7 @@ class ScreenCast(bpy.types.Operator):
 
             bpy.ops.wm.sk_screencast_keys('INVOKE_DEFAULT')
 
-        # force handler update via selection event
-        if context.visible_objects:
-            context.visible_objects[0].select_set(context.visible_objects[0].select_get())
+        # the window manager property doesn't cause a depsgraph update, so dispatch the HUD state change directly
+        update_HUDs(context.scene)
 
         return {'FINISHED'}
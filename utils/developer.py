@@ -1,7 +1,14 @@
 import os
+import sys
+import ast
+import hashlib
 import pkgutil
 import importlib
 import time
+from math import ceil
+from functools import wraps
+from collections import deque
+from contextlib import contextmanager
 
 
 chronicle = []
@@ -54,3 +61,510 @@ def output_traceback(self):
 
     tb = traceback.format_exc() + "\nPLEASE REPORT THIS ERROR to mesh@machin3.io"
     self.report({'ERROR'}, tb)
+
+
+def compare_mesh_fast_paths(mesh, iterations=10):
+    '''
+    time the bmesh based smooth(), flip_normals() and blast() against their bmesh-free data api versions
+    each run works on a fresh copy of the passed in mesh, which is removed again afterwards
+    '''
+
+    import bpy
+    from . mesh import smooth, smooth_mesh, flip_normals, flip_mesh_normals, blast, blast_mesh
+
+    pairs = [('smooth', lambda m: smooth(m), lambda m: smooth_mesh(m)),
+             ('flip normals', lambda m: flip_normals(m), lambda m: flip_mesh_normals(m)),
+             ('blast selected', lambda m: blast(m, 'selected', 'FACES'), lambda m: blast_mesh(m, 'selected', 'FACES', objects=[]))]
+
+    results = {}
+
+    print(f"\nComparing mesh fast paths on {mesh.name} with {len(mesh.polygons)} faces, {iterations} iterations")
+
+    for name, bmesh_func, data_func in pairs:
+        timings = []
+
+        for func in [bmesh_func, data_func]:
+            total = 0
+
+            for _ in range(iterations):
+                copy = mesh.copy()
+
+                start = time.perf_counter()
+                func(copy)
+                total += time.perf_counter() - start
+
+                bpy.data.meshes.remove(copy, do_unlink=True)
+
+            timings.append(total / iterations)
+
+        results[name] = tuple(timings)
+        print(" %s: bmesh %.6f, data api %.6f, %.1fx" % (name, *timings, timings[0] / timings[1] if timings[1] else 0))
+
+    return results
+
+
+# PROFILING
+
+# opt-in timing of handlers, draw callbacks and modal HUDs, enabled in the addon preferences' Developer tab
+profiling = False
+
+# name -> {'calls', 'total', 'timings'}, the timings being a ring buffer of the most recent calls
+profiles = {}
+profile_ring_size = 1000
+
+
+def record_profile(name, duration):
+    p = profiles.get(name)
+
+    if p is None:
+        p = profiles[name] = {'calls': 0, 'total': 0, 'timings': deque(maxlen=profile_ring_size)}
+
+    p['calls'] += 1
+    p['total'] += duration
+    p['timings'].append(duration)
+
+
+def profile(name):
+    '''
+    decorator, recording the duration of each call of the decorated function under the passed in name, while profiling is enabled
+    the wrapper keeps the function's positional argument count and defaults, as Blender reads them to decide if app handlers are called with (scene) or (scene, depsgraph)
+    '''
+
+    def decorator(func):
+
+        def call(*args):
+            if not profiling:
+                return func(*args)
+
+            start = time.perf_counter()
+
+            try:
+                return func(*args)
+
+            finally:
+                record_profile(name, time.perf_counter() - start)
+
+        argcount = func.__code__.co_argcount
+
+        if argcount == 0:
+            def wrapper():
+                return call()
+
+        elif argcount == 1:
+            def wrapper(a):
+                return call(a)
+
+        elif argcount == 2:
+            def wrapper(a, b):
+                return call(a, b)
+
+        elif argcount == 3:
+            def wrapper(a, b, c):
+                return call(a, b, c)
+
+        else:
+            def wrapper(*args):
+                return call(*args)
+
+        wrapper = wraps(func)(wrapper)
+        wrapper.__defaults__ = func.__defaults__
+
+        return wrapper
+    return decorator
+
+
+def set_profiling(state):
+    global profiling
+    profiling = state
+
+
+def reset_profiles():
+    profiles.clear()
+
+
+def get_percentile(timings, percentile):
+    '''
+    nearest-rank percentile of the passed in, sorted timings
+    '''
+
+    if not timings:
+        return 0
+
+    index = max(0, min(len(timings), ceil(percentile / 100 * len(timings))) - 1)
+    return timings[index]
+
+
+def get_profile_stats():
+    '''
+    return call counts and timings in milliseconds per profiled name, sorted by total time
+    the percentiles and the max are based on the ring buffer, so only on the most recent calls
+    '''
+
+    stats = []
+
+    for name, p in profiles.items():
+        timings = sorted(p['timings'])
+
+        stats.append({'name': name,
+                      'calls': p['calls'],
+                      'total': p['total'] * 1000,
+                      'mean': p['total'] / p['calls'] * 1000 if p['calls'] else 0,
+                      'p50': get_percentile(timings, 50) * 1000,
+                      'p95': get_percentile(timings, 95) * 1000,
+                      'p99': get_percentile(timings, 99) * 1000,
+                      'max': timings[-1] * 1000 if timings else 0})
+
+    return sorted(stats, key=lambda s: s['total'], reverse=True)
+
+
+def export_profiles(path):
+    '''
+    write the profile stats, and the raw timings in the ring buffers, as json
+    '''
+
+    import json
+
+    data = {'ring_size': profile_ring_size,
+            'stats': get_profile_stats(),
+            'timings': {name: list(p['timings']) for name, p in profiles.items()}}
+
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+    return path
+
+
+# STARTUP PROFILING
+
+# the timing tree of the currently running registration, None outside of it
+startup_profile = None
+
+# the number of startup profiles kept in the json file in the user config folder
+startup_profiles_count = 20
+
+
+class ProfileTree(Benchmark):
+    '''
+    extends the Benchmark with nested sections, entered via the section() context manager, and exportable as a dict
+    '''
+
+    def __init__(self, name, do_benchmark=False):
+        super().__init__(do_benchmark)
+
+        self.start = time.perf_counter()
+        self.root = {'name': name, 'time': 0, 'children': []}
+        self.stack = [self.root]
+
+    @contextmanager
+    def section(self, name):
+        node = {'name': name, 'time': 0, 'children': []}
+
+        self.stack[-1]['children'].append(node)
+        self.stack.append(node)
+
+        start = time.perf_counter()
+
+        try:
+            yield node
+
+        finally:
+            node['time'] = time.perf_counter() - start
+            self.stack.pop()
+
+    def finish(self):
+        self.root['time'] = time.perf_counter() - self.start
+        return self.root
+
+    def print_tree(self, node=None, depth=0):
+        if node is None:
+            node = self.root
+            print()
+
+        print("%s%s: %.2fms" % ("  " * depth, node['name'], node['time'] * 1000))
+
+        for child in node['children']:
+            self.print_tree(child, depth + 1)
+
+
+def start_startup_profile(name):
+    '''
+    start a new timing tree, a still unfinished one, like from reloading modules before registration, becomes its first section
+    '''
+
+    global startup_profile
+
+    previous = startup_profile
+    startup_profile = ProfileTree(name)
+
+    if previous:
+        startup_profile.root['children'].append(previous.finish())
+
+    return startup_profile
+
+
+@contextmanager
+def profile_section(name):
+    '''
+    time a section of the current timing tree, does nothing outside of registration
+    '''
+
+    if startup_profile:
+        with startup_profile.section(name) as node:
+            yield node
+
+    else:
+        yield None
+
+
+def startup_section(name):
+    '''
+    decorator, timing each call of the decorated function as a section of the current timing tree
+    '''
+
+    def decorator(func):
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_section(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def finish_startup_profile(persist=False, debug=False, **info):
+    '''
+    finish the current timing tree, and optionally print it, and save it to the user config folder, along with the passed in info
+    '''
+
+    global startup_profile
+
+    if not startup_profile:
+        return
+
+    tree = startup_profile
+    startup_profile = None
+
+    profile = dict(info, **tree.finish())
+
+    if debug:
+        tree.print_tree()
+
+    if persist:
+        save_startup_profile(profile)
+
+    return profile
+
+
+def get_startup_profiles_path():
+    import bpy
+    return os.path.join(bpy.utils.user_resource('CONFIG', path='MACHIN3tools', create=True), 'startup_profiles.json')
+
+
+def get_startup_profiles():
+    import json
+
+    path = get_startup_profiles_path()
+
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+
+        except (OSError, ValueError):
+            print(f"WARNING: Couldn't read MACHIN3tools startup profiles from {path}")
+
+    return []
+
+
+def save_startup_profile(profile):
+    '''
+    append the profile to the json file, only keeping the last few
+    '''
+
+    import json
+
+    profiles = (get_startup_profiles() + [profile])[-startup_profiles_count:]
+
+    try:
+        with open(get_startup_profiles_path(), 'w') as f:
+            json.dump(profiles, f, indent=1)
+
+    except OSError:
+        print("WARNING: Couldn't write MACHIN3tools startup profile")
+
+
+# MODULE RELOADING
+
+def get_package_modules(package):
+    '''
+    the loaded modules of the passed in package, that have a source file, the root and the (namespace) sub packages are excluded
+    '''
+
+    return {name: module for name, module in list(sys.modules.items()) if name.startswith(package + '.') and getattr(module, '__file__', None)}
+
+
+def get_source_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def get_module_states(package):
+    '''
+    record the source mtime and hash of each loaded module of the package
+    '''
+
+    return {name: (os.path.getmtime(module.__file__), get_source_hash(module.__file__)) for name, module in get_package_modules(package).items() if os.path.exists(module.__file__)}
+
+
+def get_changed_modules(package, states):
+    '''
+    the modules whose source changed since the states were recorded, the hash is only compared if the mtime differs, so merely touched files aren't reloaded
+    modules without recorded state are considered changed
+    '''
+
+    changed = set()
+
+    for name, module in get_package_modules(package).items():
+        path = module.__file__
+
+        # a module, whose file was removed can't be reloaded
+        if not os.path.exists(path):
+            continue
+
+        state = states.get(name)
+
+        if state is None:
+            changed.add(name)
+
+        elif os.path.getmtime(path) != state[0] and get_source_hash(path) != state[1]:
+            changed.add(name)
+
+    return changed
+
+
+def get_module_level_nodes(tree):
+    '''
+    wrap all nodes of the parsed module, that are executed on import, in a new module, skipping function bodies
+    '''
+
+    nodes = []
+    stack = list(ast.iter_child_nodes(tree))
+
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            continue
+
+        nodes.append(node)
+        stack.extend(ast.iter_child_nodes(node))
+
+    return ast.Module(body=[node for node in nodes if isinstance(node, (ast.Import, ast.ImportFrom))], type_ignores=[])
+
+
+def get_module_imports(name, module, modules):
+    '''
+    the package modules, the passed in module imports from when it's executed
+    imports inside of functions are skipped, as they are resolved when called, and so always pick up the reloaded module
+    '''
+
+    with open(module.__file__, encoding='utf-8') as f:
+        source = f.read()
+
+    tree = None
+    lines = source.splitlines()
+
+    # module level imports are usually unindented single lines, so only parse those, which is much faster than parsing the entire module
+    # unless there are module level blocks, which may contain indented imports
+    if not any(line.startswith(('try:', 'if ', 'with ', 'for ', 'while ')) for line in lines):
+        try:
+            tree = ast.parse('\n'.join(line for line in lines if line.startswith(('from ', 'import '))))
+
+        # e.g. parenthesized, multi-line imports
+        except SyntaxError:
+            pass
+
+    if tree is None:
+        try:
+            tree = ast.parse(source, filename=module.__file__)
+
+        # the reload will raise the actual error
+        except SyntaxError:
+            return set()
+
+        tree = get_module_level_nodes(tree)
+
+    parts = name.split('.')[:-1]
+    imports = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level:
+            target = '.'.join(parts[:len(parts) - node.level + 1] + (node.module.split('.') if node.module else []))
+
+            for alias in node.names:
+
+                # from . utils import registration
+                if f"{target}.{alias.name}" in modules:
+                    imports.add(f"{target}.{alias.name}")
+
+                # from .. utils.registration import get_prefs
+                elif target in modules:
+                    imports.add(target)
+
+        elif isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names if alias.name in modules)
+
+    imports.discard(name)
+    return imports
+
+
+def get_import_graph(package):
+    '''
+    module name -> the names of the package modules it imports
+    '''
+
+    modules = get_package_modules(package)
+
+    return {name: get_module_imports(name, module, modules) for name, module in modules.items()}
+
+
+def get_reload_order(graph, changed):
+    '''
+    the changed modules and all modules depending on them, directly or indirectly, ordered so each module is reloaded after the modules it imports
+    circular imports are broken up at the first module encountered, in alphabetical order
+    '''
+
+    dependents = {name: set() for name in graph}
+
+    for name, imports in graph.items():
+        for imp in imports:
+            dependents[imp].add(name)
+
+    reload = set()
+    stack = list(changed)
+
+    while stack:
+        name = stack.pop()
+
+        if name not in reload:
+            reload.add(name)
+            stack.extend(dependents.get(name, ()))
+
+    order = []
+    visited = set()
+
+    def visit(name):
+        if name not in visited:
+            visited.add(name)
+
+            for imp in sorted(graph.get(name, ())):
+                visit(imp)
+
+            if name in reload:
+                order.append(name)
+
+    for name in sorted(reload):
+        visit(name)
+
+    return order
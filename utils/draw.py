@@ -1,5 +1,6 @@
 import bpy
 from mathutils import Vector, Matrix
+import numpy as np
 import gpu
 from gpu_extras.batch import batch_for_shader
 import blf
@@ -7,6 +8,7 @@ from . wm import get_last_operators
 from . registration import get_prefs
 from . ui import require_header_offset
 from .. colors import red, green, blue, black, white
+from . developer import profile
 
 
 def add_object_axes_drawing_handler(dns, context, objs, draw_cursor):
@@ -27,71 +29,84 @@ def remove_object_axes_drawing_handler(handler=None):
         bpy.types.SpaceView3D.draw_handler_remove(handler, 'WINDOW')
         del bpy.app.driver_namespace['draw_object_axes']
 
+        remove_batch('object_axes')
 
+
+# bumped by the update_HUDs handler, whenever objects are transformed, so the axes are only recomputed then
+object_axes_version = 0
+
+
+def tag_object_axes():
+    global object_axes_version
+    object_axes_version += 1
+
+
+@profile('draw_object_axes')
 def draw_object_axes(args):
     context, objs, draw_cursor = args
 
     if context.space_data.overlay.show_overlays:
-        axes = [(Vector((1, 0, 0)), red), (Vector((0, 1, 0)), green), (Vector((0, 0, 1)), blue)]
-
         size = context.scene.M3.object_axes_size
         alpha = context.scene.M3.object_axes_alpha
 
-        for axis, color in axes:
-            coords = []
+        cmx = context.scene.cursor.matrix if draw_cursor and context.space_data.overlay.show_cursor else None
+
+        # all axes of all objects are drawn from a single batch, which is only rebuilt if the objects, their transforms or the settings changed
+        version = (object_axes_version, id(objs), size, alpha, tuple(map(tuple, cmx)) if cmx is not None else None)
+
+        cached = batches.get('object_axes')
 
-            # draw object(s)
-            for obj in objs:
-                mx = obj.matrix_world
-                origin = mx.decompose()[0]
+        if not cached or cached[0] != version:
+            mxs = np.array([obj.matrix_world for obj in objs], dtype=np.float32).reshape(-1, 4, 4)
+            coords, colors = get_object_axes_coords(mxs, size, alpha)
 
-                # coords.append(origin)
-                coords.append(origin + mx.to_3x3() @ axis * size * 0.1)
-                coords.append(origin + mx.to_3x3() @ axis * size)
+            # the cursor axes are drawn at half the size
+            if cmx is not None:
+                ccoords, ccolors = get_object_axes_coords(np.array(cmx, dtype=np.float32).reshape(-1, 4, 4), size * 0.5, alpha)
 
-            # cursor
-            if draw_cursor and context.space_data.overlay.show_cursor:
-                cmx = context.scene.cursor.matrix
-                corigin = cmx.decompose()[0]
+                coords = np.concatenate((coords, ccoords))
+                colors = np.concatenate((colors, ccolors))
 
-                coords.append(corigin + cmx.to_3x3() @ axis * size * 0.1 * 0.5)
-                coords.append(corigin + cmx.to_3x3() @ axis * size * 0.5)
+            if not len(coords):
+                remove_batch('object_axes')
+                return
 
-            """
-            # debuging stash + stashtargtmx for object origin changes
-            for stash in obj.MM.stashes:
-                if s tash.obj:
-                    smx = sta sh.obj.MM.stashmx
-                    sorigin = smx.decompose()[0]
+            get_batch('LINES', coords, colors=colors, key='object_axes', version=version)
 
-                    coords.append(sorigin + smx.to_3x3() @ axis * size * 0.1)
-                    coords.append(sorigin + smx.to_3x3() @ axis * size)
+        shader = get_shader('3D_SMOOTH_COLOR')
+        shader.bind()
+
+        gpu.state.depth_test_set('NONE')
+        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
+        gpu.state.line_width_set(2)
+
+        use_legacy_line_smoothing(alpha, 2)
 
+        batches['object_axes'][1].draw(shader)
 
-                    stmx = stash.obj.MM.stashtargetmx
-                    storigin = stmx.decompose()[0]
 
-                    coords.append(storigin + stmx.to_3x3() @ axis * size * 0.1)
-                    coords.append(storigin + stmx.to_3x3() @ axis * size)
-            """
+def get_object_axes_coords(mxs, size, alpha=1):
+    '''
+    return the line coords and per-vertex colors of the x, y and z axes for a stack of (N, 4, 4) world matrices
+    each axis line starts at a tenth of its length, and the axes include the matrices' scale, like mx.to_3x3() does
+    '''
 
-            if coords:
-                indices = [(i, i + 1) for i in range(0, len(coords), 2)]
+    origins = mxs[:, :3, 3]
+    coords = np.empty((3, len(mxs), 2, 3), dtype=np.float32)
+    colors = np.empty((3, len(mxs), 2, 4), dtype=np.float32)
 
-                shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-                shader.bind()
-                shader.uniform_float("color", (*color, alpha))
+    for idx, color in enumerate([red, green, blue]):
+        axes = mxs[:, :3, idx]
 
-                gpu.state.depth_test_set('NONE')
-                gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-                gpu.state.line_width_set(2)
+        coords[idx, :, 0] = origins + axes * size * 0.1
+        coords[idx, :, 1] = origins + axes * size
 
-                use_legacy_line_smoothing(alpha, 2)
+        colors[idx] = (*color, alpha)
 
-                batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-                batch.draw(shader)
+    return coords.reshape(-1, 3), colors.reshape(-1, 4)
 
 
+@profile('draw_focus_HUD')
 def draw_focus_HUD(context, color=(1, 1, 1), alpha=1, width=2):
     if context.space_data.overlay.show_overlays:
         region = context.region
@@ -140,6 +155,7 @@ def draw_focus_HUD(context, color=(1, 1, 1), alpha=1, width=2):
             blf.draw(font, title)
 
 
+@profile('draw_surface_slide_HUD')
 def draw_surface_slide_HUD(context, color=(1, 1, 1), alpha=1, width=2):
     if context.space_data.overlay.show_overlays:
         region = context.region
@@ -162,9 +178,10 @@ def draw_surface_slide_HUD(context, color=(1, 1, 1), alpha=1, width=2):
         blf.draw(font, title)
 
 
+@profile('draw_screen_cast_HUD')
 def draw_screen_cast_HUD(context):
     p = get_prefs()
-    operators = get_last_operators(context, debug=False)[-p.screencast_operator_count:]
+    operators = get_last_operators(context, count=p.screencast_operator_count)
 
     font = 0
     scale = context.preferences.view.ui_scale * get_prefs().HUD_scale
@@ -185,14 +202,16 @@ def draw_screen_cast_HUD(context):
 
     # get addon prefix offset, based on widest possiblestring 'MM', and based on empasized last op's size
     if p.screencast_show_addon:
-        blf.size(font, round(p.screencast_fontsize * scale * emphasize), 72)
-        addon_offset_x = blf.dimensions(font, 'MM')[0]
+        addon_offset_x = get_text_dimensions(font, round(p.screencast_fontsize * scale * emphasize), 'MM')[0]
     else:
         addon_offset_x = 0
 
     y = 0
     hgap = 10
 
+    # the size of the previously drawn op, the vertical offset of each op is based on it
+    prev_size = None
+
     for idx, (addon, label, idname, prop) in enumerate(reversed(operators)):
         size = round(p.screencast_fontsize * scale * (emphasize if idx == 0 else 1))
         vgap = round(size / 2)
@@ -213,7 +232,7 @@ def draw_screen_cast_HUD(context):
         text = f"{label}: {prop}" if prop else label
 
         x = offset_x + addon_offset_x
-        y = offset_y * scale if idx == 0 else y + (blf.dimensions(font, text)[1] + vgap)
+        y = offset_y * scale if idx == 0 else y + (get_text_dimensions(font, prev_size, text)[1] + vgap)
 
         blf.size(font, size, 72)
         blf.color(font, *color, alpha)
@@ -225,7 +244,7 @@ def draw_screen_cast_HUD(context):
         # idname
 
         if p.screencast_show_idname:
-            x += blf.dimensions(font, text)[0] + hgap
+            x += get_text_dimensions(font, size, text)[0] + hgap
 
             blf.size(font, size - 2, 72)
             blf.color(font, *color, alpha * 0.3)
@@ -247,7 +266,7 @@ def draw_screen_cast_HUD(context):
         if addon and p.screencast_show_addon:
             blf.size(font, size, 72)
 
-            x = offset_x + addon_offset_x - blf.dimensions(font, addon)[0] - (hgap / 2)
+            x = offset_x + addon_offset_x - get_text_dimensions(font, size, addon)[0] - (hgap / 2)
 
             blf.color(font, *white, alpha * 0.3)
             blf.position(font, x, y, 0)
@@ -255,7 +274,28 @@ def draw_screen_cast_HUD(context):
             blf.draw(font, addon)
 
         if idx == 0:
-            y += blf.dimensions(font, text)[1]
+            y += get_text_dimensions(font, size, text)[1]
+
+        prev_size = size
+
+
+# (font, size, text) -> text dimensions, measuring text is relatively expensive, and the screen cast draws the same texts on every redraw
+text_dimensions = {}
+
+
+def get_text_dimensions(font, size, text):
+    dimensions = text_dimensions.get((font, size, text))
+
+    if dimensions is None:
+
+        # keep the cache from growing indefinitely
+        if len(text_dimensions) > 1000:
+            text_dimensions.clear()
+
+        blf.size(font, size, 72)
+        dimensions = text_dimensions[(font, size, text)] = blf.dimensions(font, text)
+
+    return dimensions
 
 
 def draw_label(context, title='', coords=None, center=True, color=(1, 1, 1), alpha=1):
@@ -305,9 +345,16 @@ def use_legacy_line_smoothing(alpha, width):
             pass
 
 
-def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True):
+def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, key=None, version=None):
+    batch = None
+
     def draw():
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        nonlocal batch
+
+        if batch is None or key is not None:
+            batch = get_batch('POINTS', [co], mx=mx, key=key, version=version)
+
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -315,19 +362,25 @@ def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, mod
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
         gpu.state.point_size_set(size)
 
-        batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co]})
         batch.draw(shader)
 
     if modal:
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_point')(draw), (), 'WINDOW', 'POST_VIEW')
+
 
+def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, key=None, version=None):
+    batch = None
 
-def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True):
     def draw():
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        nonlocal batch
+
+        if batch is None or key is not None:
+            batch = get_batch('POINTS', coords, indices=indices, mx=mx, key=key, version=version)
+
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -335,40 +388,30 @@ def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alph
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
         gpu.state.point_size_set(size)
 
-        if indices:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]}, indices=indices)
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords}, indices=indices)
-
-        else:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]})
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords})
-
         batch.draw(shader)
 
-
     if modal:
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_points')(draw), (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
+def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None, version=None):
     """
     takes coordinates and draws a single line
     can optionally take an indices argument to specify how it should be drawn
     """
+
+    batch = None
+
     def draw():
-        nonlocal indices
+        nonlocal batch
 
-        if not indices:
-            indices = [(i, i + 1) for i in range(0, len(coords)) if i < len(coords) - 1]
+        if batch is None or key is not None:
+            batch = get_batch('LINES', coords, indices=indices if indices else get_line_indices(len(coords)), mx=mx, key=key, version=version)
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -378,27 +421,29 @@ def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha
 
         use_legacy_line_smoothing(alpha, width)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
         batch.draw(shader)
 
     if modal:
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_line')(draw), (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
+def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None, version=None):
     """
     takes an even amount of coordinates and draws half as many 2-point lines
     """
+
+    batch = None
+
     def draw():
-        nonlocal indices
+        nonlocal batch
 
-        if not indices:
-            indices = [(i, i + 1) for i in range(0, len(coords), 2)]
+        if batch is None or key is not None:
+            batch = get_batch('LINES', coords, indices=indices if indices else get_lines_indices(len(coords)), mx=mx, key=key, version=version)
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -408,26 +453,25 @@ def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alph
 
         use_legacy_line_smoothing(alpha, width)
 
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
-
-        else:
-            batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-
         batch.draw(shader)
 
     if modal:
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_lines')(draw), (), 'WINDOW', 'POST_VIEW')
+
 
+def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None, version=None):
+    batch = None
 
-def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
     def draw():
-        coords = [mx @ origin, mx @ origin + mx.to_3x3() @ vector]
+        nonlocal batch
+
+        if batch is None or key is not None:
+            batch = get_batch('LINES', get_vector_coords([vector], [origin]), mx=mx, key=key, version=version)
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -437,7 +481,6 @@ def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1),
 
         use_legacy_line_smoothing(alpha, width)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": coords})
         batch.draw(shader)
 
 
@@ -445,20 +488,19 @@ def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1),
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_vector')(draw), (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
-    def draw():
-        coords = []
+def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None, version=None):
+    batch = None
 
-        for v, o in zip(vectors, origins):
-            coords.append(mx @ o)
-            coords.append(mx @ o + mx.to_3x3() @ v)
+    def draw():
+        nonlocal batch
 
-        indices = [(i, i + 1) for i in range(0, len(coords), 2)]
+        if batch is None or key is not None:
+            batch = get_batch('LINES', get_vector_coords(vectors, origins), mx=mx, key=key, version=version)
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -468,7 +510,6 @@ def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=
 
         use_legacy_line_smoothing(alpha, width)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
         batch.draw(shader)
 
 
@@ -476,18 +517,24 @@ def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_vectors')(draw), (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
+def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None, version=None):
     """
     takes tupple of (coords, indices) and draws a line for each edge index
     """
+
+    coords, indices = batch
+    b = None
+
     def draw():
-        nonlocal batch
-        coords, indices = batch
+        nonlocal b
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        if b is None or key is not None:
+            b = get_batch('LINES', coords, indices=indices, key=key, version=version)
+
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -497,22 +544,25 @@ def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=Tr
 
         use_legacy_line_smoothing(alpha, width)
 
-        b = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
         b.draw(shader)
 
-        del shader
-        del b
-
     if modal:
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_mesh_wire')(draw), (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
+def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None, version=None):
+    batch = None
+
     def draw():
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        nonlocal batch
+
+        if batch is None or key is not None:
+            batch = get_batch('TRIS', coords, indices=indices, mx=mx, key=key, version=version)
+
+        shader = get_shader('3D_UNIFORM_COLOR')
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -520,16 +570,133 @@ def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
         gpu.state.line_width_set(width)
 
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'TRIS', {"pos": [mx @ co for co in coords]}, indices=indices)
-
-        else:
-            batch = batch_for_shader(shader, 'TRIS', {"pos": coords}, indices=indices)
-
         batch.draw(shader)
 
     if modal:
         draw()
 
     else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        bpy.types.SpaceView3D.draw_handler_add(profile('draw_tris')(draw), (), 'WINDOW', 'POST_VIEW')
+
+
+# BATCHES
+
+# builtin shaders are fetched only once
+shaders = {}
+
+# key -> (version, batch), batches are only rebuilt and re-uploaded, when a caller passes in a new version for its key
+batches = {}
+
+
+def get_shader(name):
+    shader = shaders.get(name)
+
+    if shader is None:
+        shader = shaders[name] = gpu.shader.from_builtin(name)
+
+    return shader
+
+
+def get_batch(type, coords, indices=None, mx=None, colors=None, key=None, version=None):
+    '''
+    return a batch for the passed in coords, which are transformed by mx in numpy
+    if a key is passed in, the batch is cached, and only rebuilt if the version changes
+    '''
+
+    if key is not None:
+        cached = batches.get(key)
+
+        if cached and cached[0] == version:
+            return cached[1]
+
+    content, indices = prepare_batch(coords, indices=indices, mx=mx, colors=colors)
+
+    shader = get_shader('3D_SMOOTH_COLOR' if colors is not None else '3D_UNIFORM_COLOR')
+    batch = batch_for_shader(shader, type, content, indices=indices)
+
+    if key is not None:
+        batches[key] = (version, batch)
+
+    return batch
+
+
+def remove_batch(key=None):
+    '''
+    remove the cached batch for the passed in key, or all of them
+    '''
+
+    if key is None:
+        batches.clear()
+
+    elif key in batches:
+        del batches[key]
+
+
+# BATCH PREPARATION
+
+# the cpu side of batch creation, free of any gpu calls, so it can be used and tested in background mode too
+
+def prepare_batch(coords, indices=None, mx=None, colors=None):
+    '''
+    return the batch content dict of contiguous float32 arrays and the int32 indices
+    '''
+
+    content = {"pos": transform_coords(coords, mx)}
+
+    if colors is not None:
+        content["color"] = np.ascontiguousarray(colors, dtype=np.float32).reshape(-1, 4)
+
+    if indices is not None:
+        indices = np.ascontiguousarray(indices, dtype=np.int32)
+
+        if not len(indices):
+            indices = None
+
+    return content, indices
+
+
+def transform_coords(coords, mx=None):
+    '''
+    return the coords as a contiguous (N, 3) float32 array, transformed by mx, unless it's None or the identity matrix
+    '''
+
+    coords = np.array(coords, dtype=np.float32).reshape(-1, 3)
+
+    if mx is not None and mx != Matrix():
+        mx = np.array(mx, dtype=np.float32)
+        coords = coords @ mx[:3, :3].T + mx[:3, 3]
+
+    return np.ascontiguousarray(coords, dtype=np.float32)
+
+
+def get_vector_coords(vectors, origins):
+    '''
+    return interleaved origin and end point coords, for drawing vectors as lines
+    '''
+
+    origins = np.array(origins, dtype=np.float32).reshape(-1, 3)
+    vectors = np.array(vectors, dtype=np.float32).reshape(-1, 3)
+
+    coords = np.empty((len(origins) * 2, 3), dtype=np.float32)
+    coords[0::2] = origins
+    coords[1::2] = origins + vectors
+
+    return coords
+
+
+def get_line_indices(count):
+    '''
+    indices connecting count coords to a single line
+    '''
+
+    i = np.arange(max(count - 1, 0), dtype=np.int32)
+    return np.column_stack((i, i + 1))
+
+
+def get_lines_indices(count):
+    '''
+    indices connecting each pair of coords to a separate line
+    '''
+
+    i = np.arange(0, count - 1, 2, dtype=np.int32)
+    return np.column_stack((i, i + 1))
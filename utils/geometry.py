@@ -1,5 +1,7 @@
 from math import cos, sin, pi
+from functools import lru_cache
 from mathutils import Vector
+import numpy as np
 
 
 def calculate_thread(segments=12, loops=2, radius=1, depth=0.1, h1=0.2, h2=0.0, h3=0.2, h4=0.0, fade=0.15):
@@ -112,3 +114,185 @@ def calculate_thread(segments=12, loops=2, radius=1, depth=0.1, h1=0.2, h2=0.0,
                         top_indices.append([len(top_coords) + i for i in [-4, -2, -1, -3]])
 
     return (coords, indices), (bottom_coords, bottom_indices), (top_coords, top_indices), height + height * loops
+
+
+def calculate_thread_arrays(segments=12, loops=2, radius=1, depth=0.1, h1=0.2, h2=0.0, h3=0.2, h4=0.0, fade=0.15):
+    '''
+    numpy version of calculate_thread(), creating the same geometry for the thread, bottom and top faces, in that order, using broadcasting instead of nested loops
+    return coords, the flat vertex indices of all face loops, the vertex count of each face, the vertex index pairs of the sharp edges, and the total height of the thread
+    '''
+
+    height = h1 + h2 + h3 + h4
+
+    # fade determines how many of the segments falloff
+    falloff = segments * fade
+
+    # profile radii and heights, there are 3-5 coords, depending on the h2 and h4 "spacer values"
+    profile_r = [radius, radius + depth] + ([radius + depth] if h2 > 0 else []) + [radius] + ([radius] if h4 > 0 else [])
+    profile_z = [0, h1] + ([h1 + h2] if h2 > 0 else []) + [h1 + h2 + h3] + ([h1 + h2 + h3 + h4] if h4 > 0 else [])
+
+    pcount = len(profile_r)
+
+    # the crest coords are the ones, that fade into the inner radius on the first and last segments
+    crest = np.zeros(pcount, dtype=bool)
+    crest[[1, 2] if h2 else [1]] = True
+
+
+    # THREAD
+
+    loop = np.arange(loops)[:, None, None]
+    segment = np.arange(segments + 1)[None, :, None]
+
+    r = np.broadcast_to(np.array(profile_r, dtype=np.float64), (loops, segments + 1, pcount)).copy()
+
+    if falloff:
+        fade_in = (loop == 0) & (segment <= falloff) & crest
+        fade_out = ~fade_in & (loop == loops - 1) & (segments - segment <= falloff) & crest
+
+        r = np.where(fade_in, radius + depth * segment / falloff, r)
+        r = np.where(fade_out, radius + depth * (segments - segment) / falloff, r)
+
+    angle = segment * 2 * pi / segments
+
+    # slightly increase each profile coords height per segment, and offset it per loop too
+    z = np.array(profile_z) + (segment / segments) * height + (height * loop)
+
+    coords = np.stack([r * np.cos(angle), r * np.sin(angle), np.broadcast_to(z, r.shape)], axis=-1).reshape(-1, 3)
+
+    # pcount - 1 rows of quads between each segment and the previous one
+    base = ((np.arange(loops)[:, None] * (segments + 1) + np.arange(1, segments + 1)[None, :]) * pcount)[:, :, None] + np.arange(pcount - 1)
+    indices = np.stack([base - pcount, base, base + 1, base - pcount + 1], axis=-1).reshape(-1, 4)
+
+
+    # BOTTOM
+
+    angles = np.arange(segments) * 2 * pi / segments
+    rim = np.stack([radius * np.cos(angles), radius * np.sin(angles)], axis=-1)
+
+    # every segment but the last has a point at z == 0 and the first point in the profile, the last one has coords for all the verts of the profile
+    bottom_coords = np.empty((segments * 2 + pcount, 3))
+    bottom_coords[:segments * 2:2, :2] = rim
+    bottom_coords[:segments * 2:2, 2] = 0
+    bottom_coords[1:segments * 2:2, :2] = rim
+    bottom_coords[1:segments * 2:2, 2] = np.arange(segments) / segments * height
+    bottom_coords[segments * 2:] = [(radius, 0, pz) for pz in profile_z]
+
+    s = np.arange(1, segments)[:, None]
+    bottom_quads = np.hstack([2 * (s - 1), 2 * s, 2 * s + 1, 2 * s - 1])
+
+    # the last face will have 5-7 verts, depending on h2 and h4
+    bottom_ngon = np.array([2 * segments - 1, 2 * segments - 2] + [2 * segments + i for i in range(pcount)])
+
+
+    # TOP
+
+    top_z = profile_z[-1] + height * (loops - 1)
+
+    # the first segment has coords for all the verts of the profile, every other segment has a point at the last point in the profile and at max height
+    top_rim = np.stack([radius * np.cos(angles + 2 * pi / segments), radius * np.sin(angles + 2 * pi / segments)], axis=-1)
+
+    top_coords = np.empty((pcount + segments * 2, 3))
+    top_coords[:pcount] = [(radius, 0, pz + height + height * (loops - 1)) for pz in profile_z]
+    top_coords[pcount::2, :2] = top_rim
+    top_coords[pcount::2, 2] = top_z + np.arange(1, segments + 1) / segments * height
+    top_coords[pcount + 1::2, :2] = top_rim
+    top_coords[pcount + 1::2, 2] = 2 * height + height * (loops - 1)
+
+    # the first face will have 5-7 verts, depending on h2 and h4
+    top_ngon = np.array([pcount, pcount + 1] + [pcount - 1 - i for i in range(pcount)])
+
+    s = np.arange(2, segments + 1)[:, None]
+    top_quads = np.hstack([pcount + 2 * s - 4, pcount + 2 * s - 2, pcount + 2 * s - 1, pcount + 2 * s - 3])
+
+
+    # COMBINE
+
+    bottom_offset = len(coords)
+    top_offset = bottom_offset + len(bottom_coords)
+
+    coords = np.concatenate([coords, bottom_coords, top_coords])
+
+    loop_verts = np.concatenate([indices.reshape(-1),
+                                 bottom_quads.reshape(-1) + bottom_offset, bottom_ngon + bottom_offset,
+                                 top_ngon + top_offset, top_quads.reshape(-1) + top_offset])
+
+    loop_totals = np.concatenate([np.full(len(indices), 4), np.full(len(bottom_quads), 4), [len(bottom_ngon)], [len(top_ngon)], np.full(len(top_quads), 4)]).astype(np.int32)
+
+
+    # SHARP EDGES
+
+    # the edges running along the segments are sharp, for the thread those are the first and third edge of each quad
+    # for the bottom and top quads it's the same, for the ngons it's the second and the last edge
+    quads = np.concatenate([indices, bottom_quads + bottom_offset, top_quads + top_offset])
+    ngons = [bottom_ngon + bottom_offset, top_ngon + top_offset]
+
+    sharp_edges = np.concatenate([quads[:, [0, 1]], quads[:, [2, 3]],
+                                  [(ngon[1], ngon[2]) for ngon in ngons], [(ngon[-1], ngon[0]) for ngon in ngons]])
+
+    return coords, loop_verts.astype(np.int32), loop_totals, sharp_edges.astype(np.int32), height + height * loops
+
+
+@lru_cache(maxsize=64)
+def get_cached_thread_arrays(*args):
+    arrays = calculate_thread_arrays(*args)
+
+    # the arrays are shared between callers, so protect them from being modified
+    for array in arrays[:4]:
+        array.setflags(write=False)
+
+    return arrays
+
+
+def get_thread_arrays(segments=12, loops=2, radius=1, depth=0.1, h1=0.2, h2=0.0, h3=0.2, h4=0.0, fade=0.15, precision=6):
+    '''
+    memoized calculate_thread_arrays(), keyed by the rounded parameters, so re-executing the thread operator with the same values, doesn't regenerate the same profile
+    '''
+
+    return get_cached_thread_arrays(segments, loops, *(round(value, precision) for value in [radius, depth, h1, h2, h3, h4, fade]))
+
+
+def calculate_quadsphere(subdivisions=4, equal_area=False):
+    '''
+    create the coords and face indices of a spherified cube of radius 1, with 2 ** subdivisions faces along each cube edge
+    the grid of each cube face is created in lattice coordinates, so the verts along the seams are shared, then projected onto the sphere
+    by default the coords are simply normalized, equal_area spreads them more evenly, avoiding the dense areas at the cube corners
+    return coords, the flat vertex indices of all face loops and the vertex count of each face
+    '''
+
+    n = 2 ** subdivisions
+    size = n + 1
+
+    # cube faces as (axis, side, u axis, v axis), with u x v pointing outwards, so the faces wind counter clock wise
+    cube_faces = [(0, n, 1, 2), (0, 0, 2, 1), (1, n, 2, 0), (1, 0, 0, 2), (2, n, 0, 1), (2, 0, 1, 0)]
+
+    i, j = np.meshgrid(np.arange(size), np.arange(size), indexing='ij')
+
+    lattice = np.empty((len(cube_faces), size, size, 3), dtype=np.int64)
+
+    for idx, (axis, side, u, v) in enumerate(cube_faces):
+        lattice[idx, :, :, axis] = side
+        lattice[idx, :, :, u] = i
+        lattice[idx, :, :, v] = j
+
+    # verts at the same lattice position are shared between cube faces
+    keys = (lattice[..., 0] * size + lattice[..., 1]) * size + lattice[..., 2]
+    unique_keys, vert_indices = np.unique(keys.reshape(-1), return_inverse=True)
+    vert_indices = vert_indices.reshape(len(cube_faces), size, size)
+
+    lattice = np.stack([unique_keys // (size * size), unique_keys // size % size, unique_keys % size], axis=-1)
+    coords = lattice / n * 2 - 1
+
+    if equal_area:
+        squared = coords ** 2
+        x2, y2, z2 = squared[:, 0], squared[:, 1], squared[:, 2]
+
+        coords = coords * np.sqrt(np.stack([1 - y2 / 2 - z2 / 2 + y2 * z2 / 3,
+                                            1 - z2 / 2 - x2 / 2 + z2 * x2 / 3,
+                                            1 - x2 / 2 - y2 / 2 + x2 * y2 / 3], axis=-1))
+
+    else:
+        coords /= np.linalg.norm(coords, axis=1)[:, None]
+
+    quads = np.stack([vert_indices[:, :-1, :-1], vert_indices[:, 1:, :-1], vert_indices[:, 1:, 1:], vert_indices[:, :-1, 1:]], axis=-1).reshape(-1, 4)
+
+    return coords, quads.reshape(-1).astype(np.int32), np.full(len(quads), 4, dtype=np.int32)
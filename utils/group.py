@@ -1,6 +1,8 @@
 import bpy
+import time
+import re
 from mathutils import Vector, Quaternion
-from . object import parent, unparent
+from . object import parent, unparent, get_children, invalidate_hierarchy, get_group_empties, pop_hierarchy_changes
 from . math import average_locations, get_loc_matrix, get_rot_matrix
 from . import registration as r
 
@@ -33,55 +35,139 @@ def group(context, sel, location='AVERAGE', rotation='WORLD'):
 
 
 def ungroup(empty):
-    for obj in empty.children:
+    for obj in get_children(empty):
         unparent(obj)
         obj.M3.is_group_object = False
 
     bpy.data.objects.remove(empty, do_unlink=True)
+    invalidate_hierarchy()
 
 
-def clean_up_groups(context):
-    for obj in context.scene.objects:
+def clean_up_groups(context, full=False):
+    '''
+    only re-validate the objects whose parent or group state changed since the last clean up, and check all group empties for being empty
+    do a full scan of the scene instead, if the changes aren't known, like after loading a file, or if requested explicitly as a repair
+    '''
+
+    changes = pop_hierarchy_changes()
+
+    if full or changes is None:
+        start = time.perf_counter()
+
+        names = [obj.name for obj in context.scene.objects]
+
+        for name in names:
+            clean_up_group_object(context, name)
+
+        print(f"INFO: Cleaned up groups, checked {len(names)} objects in {time.perf_counter() - start:.6f}s")
+
+    else:
+        names = changes | {obj.name for obj in get_group_empties()}
+
+        for name in names:
+            clean_up_group_object(context, name)
 
-        # remove empty groups
-        if obj.M3.is_group_empty and not obj.children:
-            print("INFO: Removing empty Group", obj.name)
-            bpy.data.objects.remove(obj, do_unlink=True)
 
-        elif obj.M3.is_group_object:
-            if obj.parent:
+def clean_up_group_object(context, name):
+    # fetch by name, as a previous clean up may have removed the object already
+    obj = context.scene.objects.get(name)
 
-                # group objects whose parent is not a group empty are no longer group objects
-                if not obj.parent.M3.is_group_empty:
-                    obj.M3.is_group_object = False
-                    print(f"INFO: {obj.name} is no longer a group object, because it's parent {obj.parent.name} is not a group empty", obj.name)
+    if not obj:
+        return
+
+    # remove empty groups
+    if obj.M3.is_group_empty and not get_children(obj):
+        print("INFO: Removing empty Group", obj.name)
+        bpy.data.objects.remove(obj, do_unlink=True)
+        invalidate_hierarchy()
+
+    elif obj.M3.is_group_object:
+        if obj.parent:
 
-            # and neither are group objects without any parent
-            else:
+            # group objects whose parent is not a group empty are no longer group objects
+            if not obj.parent.M3.is_group_empty:
                 obj.M3.is_group_object = False
-                print(f"INFO: {obj.name} is no longer a group object, because it doesn't have any parent", obj.name)
+                print(f"INFO: {obj.name} is no longer a group object, because it's parent {obj.parent.name} is not a group empty", obj.name)
+
+        # and neither are group objects without any parent
+        else:
+            obj.M3.is_group_object = False
+            print(f"INFO: {obj.name} is no longer a group object, because it doesn't have any parent", obj.name)
 
-        elif not obj.M3.is_group_object and obj.parent and obj.parent.M3.is_group_empty:
-            obj.M3.is_group_object = True
-            print(f"INFO: {obj.name} is now a group object, because it was manually parented to {obj.parent.name}", obj.name)
+    elif not obj.M3.is_group_object and obj.parent and obj.parent.M3.is_group_empty:
+        obj.M3.is_group_object = True
+        print(f"INFO: {obj.name} is now a group object, because it was manually parented to {obj.parent.name}", obj.name)
 
 
 # CONTEXT
 
+# poll results are cached per depsgraph update, the epoch is bumped by the update_group handler and on file load/undo/redo
+group_polls_epoch = 0
+group_polls_cache = {'key': None, 'polls': None}
+group_polls_stats = {'hits': 0, 'misses': 0}
+
+
+def bump_group_polls_epoch():
+    global group_polls_epoch
+    group_polls_epoch += 1
+
+
+def get_group_polls_stats():
+    '''
+    return hits, misses and the hit rate of the group polls cache
+    '''
+
+    hits = group_polls_stats['hits']
+    misses = group_polls_stats['misses']
+
+    return hits, misses, hits / (hits + misses) if hits + misses else 0
+
+
 def get_group_polls(context):
+    '''
+    panels and menus call this on every redraw, so only re-evaluate the selection, if the depsgraph, the view layer or the active object changed
+    '''
+
+    active = context.active_object
+    key = (group_polls_epoch, context.view_layer.as_pointer(), active.name if active else None)
+
+    if group_polls_cache['key'] == key:
+        group_polls_stats['hits'] += 1
+        return group_polls_cache['polls']
+
+    group_polls_stats['misses'] += 1
+
+    polls = calculate_group_polls(context)
+
+    group_polls_cache['key'] = key
+    group_polls_cache['polls'] = polls
+
+    return polls
+
+
+def calculate_group_polls(context):
     active_group = context.active_object if context.active_object and context.active_object.M3.is_group_empty and context.active_object.select_get() else None
     active_child = context.active_object if context.active_object and context.active_object.parent and context.active_object.M3.is_group_object and context.active_object.select_get() else None
 
-    group_empties = bool([obj for obj in context.visible_objects if obj.M3.is_group_empty])
-    groupable = bool([obj for obj in context.selected_objects if (obj.parent and obj.parent.M3.is_group_empty) or not obj.parent])
-    ungroupable = bool([obj for obj in context.selected_objects if obj.M3.is_group_empty]) if group_empties else False
+    sel = context.selected_objects
+
+    group_empties = any(obj.M3.is_group_empty for obj in context.visible_objects)
+    groupable = any((obj.parent and obj.parent.M3.is_group_empty) or not obj.parent for obj in sel)
+    ungroupable = any(obj.M3.is_group_empty for obj in sel) if group_empties else False
+
+    if active_group or active_child:
+        group = active_group if active_group else active_child.parent
+        children = set(get_children(group))
+
+        addable = any(obj != group and obj not in children and (not obj.parent or (obj.parent.M3.is_group_empty and not obj.parent.select_get())) for obj in sel)
 
-    addable = bool([obj for obj in context.selected_objects if obj != (active_group if active_group else active_child.parent) and obj not in (active_group.children if active_group else active_child.parent.children) and (not obj.parent or (obj.parent and obj.parent.M3.is_group_empty and not obj.parent.select_get()))]) if active_group or active_child else False
+    else:
+        addable = False
 
-    removable = bool([obj for obj in context.selected_objects if obj.M3.is_group_object])
-    selectable = bool([obj for obj in context.selected_objects if obj.M3.is_group_empty or obj.M3.is_group_object])
-    duplicatable = bool([obj for obj in context.selected_objects if obj.M3.is_group_empty])
-    groupifyable = bool([obj for obj in context.selected_objects if obj.type == 'EMPTY' and not obj.M3.is_group_empty and obj.children])
+    removable = any(obj.M3.is_group_object for obj in sel)
+    selectable = any(obj.M3.is_group_empty or obj.M3.is_group_object for obj in sel)
+    duplicatable = any(obj.M3.is_group_empty for obj in sel)
+    groupifyable = any(obj.type == 'EMPTY' and not obj.M3.is_group_empty and get_children(obj) for obj in sel)
 
     return bool(active_group), bool(active_child), group_empties, groupable, ungroupable, addable, removable, selectable, duplicatable, groupifyable
 
@@ -151,7 +237,7 @@ def get_group_matrix(context, objects, location_type='AVERAGE', rotation_type='W
 # HIERARCHY
 
 def select_group_children(view_layer, empty, recursive=False):
-    children = [c for c in empty.children if c.M3.is_group_object and c.name in view_layer.objects]
+    children = [c for c in get_children(empty) if c.M3.is_group_object and c.name in view_layer.objects]
 
     # unhide any hidden group emtpies you may encounter
     if empty.hide_get():
@@ -170,8 +256,10 @@ def get_child_depth(self, children, depth=0, init=False):
         self.depth = depth
 
     for child in children:
-        if child.children:
-            get_child_depth(self, child.children, depth + 1, init=False)
+        grandchildren = get_children(child)
+
+        if grandchildren:
+            get_child_depth(self, grandchildren, depth + 1, init=False)
 
     return self.depth
 
@@ -187,7 +275,7 @@ def fade_group_sizes(context, size=None, groups=[], init=False):
             group.empty_display_size = factor * size
             group.M3.group_size = group.empty_display_size
 
-        sub_groups = [c for c in group.children if c.M3.is_group_empty]
+        sub_groups = [c for c in get_children(group) if c.M3.is_group_empty]
 
         if sub_groups:
             fade_group_sizes(context, size=group.M3.group_size, groups=sub_groups, init=False)
@@ -195,28 +283,87 @@ def fade_group_sizes(context, size=None, groups=[], init=False):
 
 # NAMING
 
-def get_base_group_name():
-    p = r.get_prefs()
+# the highest number used per name head and tail, e.g. ('GROUP', '_grp') for 'GROUP_001_grp', built once from a single scan of all object names
+# it's updated as names are handed out and objects are renamed, but deleted objects aren't removed, so it's only a hint where to start looking for a free name
+group_name_index = None
+
 
-    if r.get_prefs().group_auto_name:
-        name = f"{p.group_prefix}{p.group_basename + '_001'}{p.group_suffix}"
+def split_name_number(name):
+    '''
+    split a name of the form head_001tail into head, number and tail, using the last underscore followed by digits, or return None
+    '''
 
-        c = 0
-        while name in bpy.data.objects:
-            c += 1
-            name = f"{p.group_prefix}{p.group_basename + '_' + str(c).zfill(3)}{p.group_suffix}"
+    match = re.match(r'^(.*)_(\d+)(.*)$', name)
 
-        return name
+    if match:
+        return match.group(1), int(match.group(2)), match.group(3)
 
-    else:
-        name = f"{p.group_basename}_001"
 
-        c = 0
-        while name in bpy.data.objects:
-            c += 1
-            name = f"{p.group_basename + '_' + str(c).zfill(3)}"
+def index_group_name(index, name):
+    split = split_name_number(name)
+
+    if split:
+        head, number, tail = split
+
+        if number > index.get((head, tail), 0):
+            index[(head, tail)] = number
 
-        return name
+
+def get_group_name_index():
+    global group_name_index
+
+    if group_name_index is None:
+        group_name_index = {}
+
+        for name in bpy.data.objects.keys():
+            index_group_name(group_name_index, name)
+
+    return group_name_index
+
+
+def reset_group_names():
+    global group_name_index
+    group_name_index = None
+
+
+def register_group_name(name):
+    '''
+    keep the index up to date, called when objects are renamed
+    '''
+
+    if group_name_index is not None:
+        index_group_name(group_name_index, name)
+
+
+def get_unique_group_name(prefix, basename, suffix):
+    '''
+    hand out the next free name of the form prefix + basename + _001 + suffix, based on the highest number used so far
+    '''
+
+    index = get_group_name_index()
+    key = (f"{prefix}{basename}", suffix)
+
+    c = index.get(key, 0) + 1
+    name = f"{prefix}{basename}_{str(c).zfill(3)}{suffix}"
+
+    # objects added since the index was built aren't in it, so double check, which usually takes a single lookup
+    while name in bpy.data.objects:
+        c += 1
+        name = f"{prefix}{basename}_{str(c).zfill(3)}{suffix}"
+
+    index[key] = c
+
+    return name
+
+
+def get_base_group_name():
+    p = r.get_prefs()
+
+    if p.group_auto_name:
+        return get_unique_group_name(p.group_prefix, p.group_basename, p.group_suffix)
+
+    else:
+        return get_unique_group_name('', p.group_basename, '')
 
 
 def update_group_name(group):
@@ -236,9 +383,7 @@ def update_group_name(group):
     if name == newname:
         return
 
-    c = 0
-    while newname in bpy.data.objects:
-        c += 1
-        newname = f"{p.group_prefix}{name + '_' + str(c).zfill(3)}{p.group_suffix}"
+    if newname in bpy.data.objects:
+        newname = get_unique_group_name(prefix, name, suffix)
 
     group.name = newname
@@ -4,37 +4,86 @@ from mathutils import Vector, Matrix
 import numpy as np
 
 
-def get_coords(mesh, mx=None, offset=0, indices=False):
+# reusable float32 and int32 buffers, pooled per key (usually an object name) and grown to the largest vertex/edge count seen
+coords_buffers = {}
+normals_buffers = {}
+indices_buffers = {}
+
+
+def get_buffer(pool, key, count, dimension=3, dtype=np.float32):
+    '''
+    fetch a buffer of at least count rows from the pool, grow it if necessary
+    return a contiguous view of exactly count rows
+    '''
+
+    buffer = pool.get(key)
+
+    if buffer is None or buffer.shape[0] < count or buffer.shape[1] != dimension:
+        buffer = np.empty((count, dimension), dtype=dtype)
+        pool[key] = buffer
+
+    return buffer[:count]
+
+
+def clear_buffers(key=None):
+    '''
+    free the pooled buffers of a specific key, or all of them
+    '''
+
+    for pool in [coords_buffers, normals_buffers, indices_buffers]:
+        if key is None:
+            pool.clear()
+        else:
+            pool.pop(key, None)
+
+
+def get_coords(mesh, mx=None, offset=0, indices=False, key=None):
+    '''
+    get float32 vertex coords, ready for gpu drawing, optionally offset along the vertex normals and transformed by mx
+    with a key, the coords are read into a buffer pooled under that key, and the returned arrays are views into it
+    so they are only valid until the next call using the same key, copy them if you need to hold on to them
+    '''
+
     verts = mesh.vertices
     vert_count = len(verts)
 
-    coords = np.empty((vert_count, 3), np.float)
-    mesh.vertices.foreach_get('co', np.reshape(coords, vert_count * 3))
+    if key is None:
+        coords = np.empty((vert_count, 3), dtype=np.float32)
+    else:
+        coords = get_buffer(coords_buffers, key, vert_count)
+
+    # float32 is what the gpu wants and what the co property stores, so this reads straight into the buffer, without conversion
+    verts.foreach_get('co', coords.reshape(-1))
 
     # offset along vertex normal
     if offset:
-        normals = np.empty((vert_count, 3), np.float)
-        mesh.vertices.foreach_get('normal', np.reshape(normals, vert_count * 3))
+        if key is None:
+            normals = np.empty((vert_count, 3), dtype=np.float32)
+        else:
+            normals = get_buffer(normals_buffers, key, vert_count)
 
-        coords = coords + normals * offset
+        verts.foreach_get('normal', normals.reshape(-1))
 
-    # bring coords into non-local space
-    if mx:
-        coords_4d = np.ones((vert_count, 4), dtype=np.float)
-        coords_4d[:, :-1] = coords
+        normals *= offset
+        coords += normals
 
-        coords = np.einsum('ij,aj->ai', mx, coords_4d)[:, :-1]
+    # bring coords into non-local space, rotation/scale and translation are applied separately, avoiding a homogeneous (N, 4) copy
+    if mx:
+        mx = np.array(mx, dtype=np.float32)
 
-    # float64 seems faster to calculate than 32, + the einsum turns it into 64 anyway
-    # but float32 is needed for gpu drawing, so convert
-    coords = np.float32(coords)
+        np.matmul(coords, mx[:3, :3].T, out=coords)
+        coords += mx[:3, 3]
 
     if indices:
         edges = mesh.edges
         edge_count = len(edges)
 
-        indices = np.empty((edge_count, 2), 'i')
-        edges.foreach_get('vertices', np.reshape(indices, edge_count * 2))
+        if key is None:
+            indices = np.empty((edge_count, 2), dtype=np.int32)
+        else:
+            indices = get_buffer(indices_buffers, key, edge_count, dimension=2, dtype=np.int32)
+
+        edges.foreach_get('vertices', indices.reshape(-1))
 
         return coords, indices
 
@@ -44,68 +93,153 @@ def get_coords(mesh, mx=None, offset=0, indices=False):
 
 # MESH
 
-def hide(mesh):
-    mesh.polygons.foreach_set('hide', [True] * len(mesh.polygons))
-    mesh.edges.foreach_set('hide', [True] * len(mesh.edges))
-    mesh.vertices.foreach_set('hide', [True] * len(mesh.vertices))
+# reusable bool buffers for bulk state writes, grown to the largest element count seen
+state_buffers = {True: np.empty(0, dtype=bool), False: np.empty(0, dtype=bool)}
 
-    mesh.update()
 
+def get_state_buffer(value, count):
+    '''
+    return a contiguous bool view of count elements, all set to value
+    '''
 
-def unhide(mesh):
-    mesh.polygons.foreach_set('hide', [False] * len(mesh.polygons))
-    mesh.edges.foreach_set('hide', [False] * len(mesh.edges))
-    mesh.vertices.foreach_set('hide', [False] * len(mesh.vertices))
+    buffer = state_buffers[value]
 
-    mesh.update()
+    if buffer.shape[0] < count:
+        buffer = np.full(count, value, dtype=bool)
+        state_buffers[value] = buffer
 
+    return buffer[:count]
 
-def unhide_select(mesh):
-    polygons = len(mesh.polygons)
-    edges = len(mesh.edges)
-    vertices = len(mesh.vertices)
 
-    mesh.polygons.foreach_set('hide', [False] * polygons)
-    mesh.edges.foreach_set('hide', [False] * edges)
-    mesh.vertices.foreach_set('hide', [False] * vertices)
+def get_material_mask(index):
+    '''
+    return face mask function, selecting the polygons using the material at the passed in index
+    '''
 
-    mesh.polygons.foreach_set('select', [True] * polygons)
-    mesh.edges.foreach_set('select', [True] * edges)
-    mesh.vertices.foreach_set('select', [True] * vertices)
+    def mask(mesh):
+        material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('material_index', material_indices)
 
-    mesh.update()
+        return material_indices == index
 
+    return mask
 
-def unhide_deselect(mesh):
-    polygons = len(mesh.polygons)
-    edges = len(mesh.edges)
-    vertices = len(mesh.vertices)
 
-    mesh.polygons.foreach_set('hide', [False] * polygons)
-    mesh.edges.foreach_set('hide', [False] * edges)
-    mesh.vertices.foreach_set('hide', [False] * vertices)
+def get_loop_face_indices(mesh):
+    '''
+    return vertex and edge indices of each loop, as well as the polygon index each loop belongs to
+    '''
 
-    mesh.polygons.foreach_set('select', [False] * polygons)
-    mesh.edges.foreach_set('select', [False] * edges)
-    mesh.vertices.foreach_set('select', [False] * vertices)
+    loop_count = len(mesh.loops)
 
-    mesh.update()
+    vert_indices = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', vert_indices)
 
+    edge_indices = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get('edge_index', edge_indices)
 
-def select(mesh):
-    mesh.polygons.foreach_set('select', [True] * len(mesh.polygons))
-    mesh.edges.foreach_set('select', [True] * len(mesh.edges))
-    mesh.vertices.foreach_set('select', [True] * len(mesh.vertices))
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
 
-    mesh.update()
+    face_indices = np.repeat(np.arange(len(mesh.polygons), dtype=np.int32), loop_totals)
 
+    return vert_indices, edge_indices, face_indices
 
-def deselect(mesh):
-    mesh.polygons.foreach_set('select', [False] * len(mesh.polygons))
-    mesh.edges.foreach_set('select', [False] * len(mesh.edges))
-    mesh.vertices.foreach_set('select', [False] * len(mesh.vertices))
 
-    mesh.update()
+def set_masked_state(mesh, prop, value, face_mask):
+    '''
+    set the prop of the polygons in face_mask to value, and flush the change to the verts and edges of those polygons
+    for hide, a vert or edge is hidden, if all of its faces are hidden
+    for select, a vert or edge is selected, if any of its faces is selected
+    '''
+
+    face_states = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get(prop, face_states)
+    face_states[face_mask] = value
+    mesh.polygons.foreach_set(prop, face_states)
+
+    vert_indices, edge_indices, face_indices = get_loop_face_indices(mesh)
+
+    # for hide, flush the visible state, so verts and edges shared with visible faces stay visible
+    loop_states = ~face_states[face_indices] if prop == 'hide' else face_states[face_indices]
+    masked_loops = face_mask[face_indices]
+
+    for elements, indices in [(mesh.vertices, vert_indices), (mesh.edges, edge_indices)]:
+        count = len(elements)
+
+        states = np.empty(count, dtype=bool)
+        elements.foreach_get(prop, states)
+
+        touched = np.zeros(count, dtype=bool)
+        touched[indices[masked_loops]] = True
+
+        flushed = np.zeros(count, dtype=bool)
+        flushed[indices[loop_states]] = True
+
+        states[touched] = ~flushed[touched] if prop == 'hide' else flushed[touched]
+        elements.foreach_set(prop, states)
+
+
+def set_mesh_states(meshes, hide=None, select=None, face_mask=None, update=True):
+    '''
+    bulk write hide and/or select states of polygons, edges and verts for many meshes at once
+    leaving hide or select at None, leaves that state untouched
+    optionally pass in a face_mask function, taking a mesh and returning a bool array over its polygons, to only affect those faces and their verts and edges
+    mesh.update() is called only once per mesh, after all states have been written
+    '''
+
+    meshes = list(meshes)
+
+    if not meshes:
+        return
+
+    states = [(prop, value) for prop, value in [('hide', hide), ('select', select)] if value is not None]
+
+    # grow the shared buffers once, to fit the largest mesh
+    if not face_mask:
+        largest = max(max(len(mesh.vertices), len(mesh.edges), len(mesh.polygons)) for mesh in meshes)
+
+        for _, value in states:
+            get_state_buffer(value, largest)
+
+    for mesh in meshes:
+        if face_mask:
+            mask = face_mask(mesh)
+
+            for prop, value in states:
+                set_masked_state(mesh, prop, value, mask)
+
+        else:
+            for prop, value in states:
+                for elements in [mesh.polygons, mesh.edges, mesh.vertices]:
+                    elements.foreach_set(prop, get_state_buffer(value, len(elements)))
+
+        if update:
+            mesh.update()
+
+
+def hide(mesh):
+    set_mesh_states([mesh], hide=True)
+
+
+def unhide(mesh):
+    set_mesh_states([mesh], hide=False)
+
+
+def unhide_select(mesh):
+    set_mesh_states([mesh], hide=False, select=True)
+
+
+def unhide_deselect(mesh):
+    set_mesh_states([mesh], hide=False, select=False)
+
+
+def select(mesh):
+    set_mesh_states([mesh], select=True)
+
+
+def deselect(mesh):
+    set_mesh_states([mesh], select=False)
 
 # BMESH
 
@@ -153,7 +287,11 @@ def flip_normals(mesh):
     bm.free()
 
 
-def join(target, objects, select=[]):
+def join_bmesh(target, objects, select=[]):
+    '''
+    bmesh based version of join(), still used for meshes with shape keys
+    '''
+
     mxi = target.matrix_world.inverted_safe()
 
     bm = bmesh.new()
@@ -161,7 +299,7 @@ def join(target, objects, select=[]):
     bm.normal_update()
     bm.verts.ensure_lookup_table()
 
-    i = bm.faces.layers.int.verify()
+    i = bm.faces.layers.int.get('M3_source') or bm.faces.layers.int.new('M3_source')
 
     if any([obj.data.use_auto_smooth for obj in objects]):
         target.data.use_auto_smooth = True
@@ -176,7 +314,7 @@ def join(target, objects, select=[]):
         bmm.normal_update()
         bmm.verts.ensure_lookup_table()
 
-        im = bmm.faces.layers.int.verify()
+        im = bmm.faces.layers.int.get('M3_source') or bmm.faces.layers.int.new('M3_source')
 
         for f in bmm.faces:
             f[im] = idx + 1
@@ -195,3 +333,470 @@ def join(target, objects, select=[]):
 
     bm.to_mesh(target.data)
     bm.clear()
+
+
+# DATA API
+
+# per element attributes carried over, when a mesh is rebuilt from arrays, as (prop, dtype, dimension)
+vert_props = [('co', np.float32, 3), ('bevel_weight', np.float32, 1), ('select', bool, 1), ('hide', bool, 1)]
+edge_props = [('use_seam', bool, 1), ('use_edge_sharp', bool, 1), ('crease', np.float32, 1), ('bevel_weight', np.float32, 1), ('select', bool, 1), ('hide', bool, 1)]
+face_props = [('material_index', np.int32, 1), ('use_smooth', bool, 1), ('select', bool, 1), ('hide', bool, 1)]
+
+
+def get_element_data(elements, props):
+    '''
+    read the passed in props of all elements into a dict of arrays
+    '''
+
+    count = len(elements)
+    data = {}
+
+    for prop, dtype, dimension in props:
+        array = np.empty(count * dimension, dtype=dtype)
+        elements.foreach_get(prop, array)
+        data[prop] = array.reshape(count, dimension) if dimension > 1 else array
+
+    return data
+
+
+def set_element_data(elements, data):
+    for prop, array in data.items():
+        elements.foreach_set(prop, array.reshape(-1))
+
+
+def get_loop_layer_data(mesh):
+    '''
+    read the per loop uv and vertex color layers, as lists of (name, active, array)
+    '''
+
+    loop_count = len(mesh.loops)
+
+    uvs = []
+
+    for layer in mesh.uv_layers:
+        array = np.empty((loop_count, 2), dtype=np.float32)
+        layer.data.foreach_get('uv', array.reshape(-1))
+        uvs.append((layer.name, layer.active, array))
+
+    colors = []
+
+    for layer in mesh.vertex_colors:
+        array = np.empty((loop_count, 4), dtype=np.float32)
+        layer.data.foreach_get('color', array.reshape(-1))
+        colors.append((layer.name, layer.active, array))
+
+    return uvs, colors
+
+
+def set_loop_layer_data(mesh, uvs, colors):
+    for name, active, array in uvs:
+        layer = mesh.uv_layers.get(name) or mesh.uv_layers.new(name=name)
+        layer.data.foreach_set('uv', array.reshape(-1))
+
+        if active:
+            mesh.uv_layers.active = layer
+
+    for name, active, array in colors:
+        layer = mesh.vertex_colors.get(name) or mesh.vertex_colors.new(name=name)
+        layer.data.foreach_set('color', array.reshape(-1))
+
+        if active:
+            mesh.vertex_colors.active = layer
+
+
+def build_mesh(mesh, verts, edges, edge_verts, faces, loop_totals, loop_verts, loop_edges, uvs=[], colors=[]):
+    '''
+    (re)build the mesh from arrays, replacing any existing geometry
+    verts, edges and faces are dicts of per element prop arrays, as returned by get_element_data()
+    '''
+
+    mesh.clear_geometry()
+
+    mesh.vertices.add(len(verts['co']))
+    set_element_data(mesh.vertices, verts)
+
+    mesh.edges.add(len(edge_verts))
+    mesh.edges.foreach_set('vertices', edge_verts.reshape(-1))
+    set_element_data(mesh.edges, edges)
+
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+
+    mesh.loops.add(len(loop_verts))
+    mesh.loops.foreach_set('vertex_index', loop_verts)
+    mesh.loops.foreach_set('edge_index', loop_edges)
+
+    mesh.polygons.add(len(loop_totals))
+    mesh.polygons.foreach_set('loop_start', loop_starts)
+    mesh.polygons.foreach_set('loop_total', loop_totals)
+    set_element_data(mesh.polygons, faces)
+
+    set_loop_layer_data(mesh, uvs, colors)
+
+    mesh.update()
+
+
+def get_mesh_from_arrays(name, coords, loop_verts, loop_totals, smooth=False):
+    '''
+    create new mesh from vertex coords and face loops, edges are calculated from the faces
+    '''
+
+    mesh = bpy.data.meshes.new(name=name)
+
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', np.asarray(coords, dtype=np.float32).reshape(-1))
+
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+
+    mesh.loops.add(len(loop_verts))
+    mesh.loops.foreach_set('vertex_index', loop_verts)
+
+    mesh.polygons.add(len(loop_totals))
+    mesh.polygons.foreach_set('loop_start', loop_starts)
+    mesh.polygons.foreach_set('loop_total', loop_totals)
+
+    mesh.update(calc_edges=True)
+
+    if smooth:
+        mesh.polygons.foreach_set('use_smooth', get_state_buffer(True, len(loop_totals)))
+
+    return mesh
+
+
+def smooth_mesh(mesh, smooth=True):
+    '''
+    bmesh-free version of smooth()
+    '''
+
+    mesh.polygons.foreach_set('use_smooth', get_state_buffer(smooth, len(mesh.polygons)))
+    mesh.update()
+
+
+def flip_mesh_normals(mesh):
+    '''
+    bmesh-free version of flip_normals(), reversing the loop order of each polygon, while keeping its first loop
+    uvs and vertex colors are reordered along with the verts, custom split normals are not preserved
+    '''
+
+    vert_indices, edge_indices, face_indices = get_loop_face_indices(mesh)
+
+    if not len(vert_indices):
+        return
+
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+
+    starts = loop_starts[face_indices]
+    totals = loop_totals[face_indices]
+    local = np.arange(len(vert_indices), dtype=np.int32) - starts
+
+    # loop k of a reversed face uses the vert of loop -k and the edge of loop -k - 1
+    vert_order = starts + (-local) % totals
+    edge_order = starts + (-local - 1) % totals
+
+    mesh.loops.foreach_set('vertex_index', vert_indices[vert_order])
+    mesh.loops.foreach_set('edge_index', edge_indices[edge_order])
+
+    uvs, colors = get_loop_layer_data(mesh)
+    set_loop_layer_data(mesh, [(name, active, array[vert_order]) for name, active, array in uvs], [(name, active, array[vert_order]) for name, active, array in colors])
+
+    mesh.update()
+
+
+# the attributes build_mesh() carries over, on Blender versions exposing the builtin mesh data as attributes, names starting with a dot are internal ones
+builtin_attributes = {'position', 'material_index', 'sharp_face', 'sharp_edge', 'crease', 'crease_vert', 'crease_edge', 'bevel_weight_vert', 'bevel_weight_edge'}
+
+
+def get_mesh_users(meshes):
+    '''
+    map the passed in meshes to the objects using them, in a single pass over all objects, so it's only done once per batch
+    '''
+
+    users = {mesh: [] for mesh in meshes}
+
+    for obj in bpy.data.objects:
+        if obj.data in users:
+            users[obj.data].append(obj)
+
+    return users
+
+
+def has_extra_mesh_data(mesh, objects=None, normals=True):
+    '''
+    check if the mesh has data, that can't be carried over, when rebuilding it from arrays: vertex group weights, custom split normals and generic attributes
+    vertex groups are checked on the passed in objects using the mesh, only if none are passed in, they are looked up
+    custom normals are ignored with normals=False, for join_mesh_arrays(), which carries them over
+    '''
+
+    if normals and mesh.has_custom_normals:
+        return True
+
+    if objects is None:
+        objects = get_mesh_users([mesh])[mesh]
+
+    # vertex groups are stored on the objects, but the weights are on the mesh
+    if any(obj.vertex_groups for obj in objects):
+        return True
+
+    layers = {layer.name for layer in mesh.uv_layers} | {layer.name for layer in mesh.vertex_colors}
+
+    return any(attr.name not in layers and attr.name not in builtin_attributes and not attr.name.startswith('.') for attr in getattr(mesh, 'attributes', []))
+
+
+def blast_mesh(mesh, prop, type, objects=None):
+    '''
+    bmesh-free version of blast(), compacting the mesh arrays and rebuilding it
+    only the FACES and FACES_ONLY delete contexts are supported, and shape keys, vertex group weights, custom normals and generic attributes can't be carried over
+    in all other cases this falls back to blast()
+    pass in the objects using the mesh, when blasting in batches, see get_mesh_users(), to avoid looking them up for each mesh
+    '''
+
+    if type not in ['FACES', 'FACES_ONLY'] or mesh.shape_keys or has_extra_mesh_data(mesh, objects):
+        blast(mesh, prop, type)
+        return
+
+    face_count = len(mesh.polygons)
+
+    states = np.empty(face_count, dtype=bool)
+    mesh.polygons.foreach_get('hide' if prop in ['hidden', 'visible'] else 'select', states)
+
+    delete_faces = ~states if prop == 'visible' else states
+
+    if not delete_faces.any():
+        return
+
+    keep_faces = ~delete_faces
+
+    vert_indices, edge_indices, face_indices = get_loop_face_indices(mesh)
+    keep_loops = keep_faces[face_indices]
+
+    edge_verts = np.empty((len(mesh.edges), 2), dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edge_verts.reshape(-1))
+
+    keep_edges = np.ones(len(mesh.edges), dtype=bool)
+    keep_verts = np.ones(len(mesh.vertices), dtype=bool)
+
+    # like bmesh, remove the edges and verts of deleted faces, unless they are still used by remaining faces, or the verts by remaining edges
+    if type == 'FACES':
+        keep_edges[edge_indices[~keep_loops]] = False
+        keep_edges[edge_indices[keep_loops]] = True
+
+        keep_verts[vert_indices[~keep_loops]] = False
+        keep_verts[vert_indices[keep_loops]] = True
+        keep_verts[edge_verts[keep_edges].reshape(-1)] = True
+
+    vert_map = np.cumsum(keep_verts, dtype=np.int32) - 1
+    edge_map = np.cumsum(keep_edges, dtype=np.int32) - 1
+
+    verts = {name: array[keep_verts] for name, array in get_element_data(mesh.vertices, vert_props).items()}
+    edges = {name: array[keep_edges] for name, array in get_element_data(mesh.edges, edge_props).items()}
+    faces = {name: array[keep_faces] for name, array in get_element_data(mesh.polygons, face_props).items()}
+
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+
+    uvs, colors = get_loop_layer_data(mesh)
+
+    build_mesh(mesh, verts, edges, vert_map[edge_verts[keep_edges]], faces, loop_totals[keep_faces], vert_map[vert_indices[keep_loops]], edge_map[edge_indices[keep_loops]],
+               uvs=[(name, active, array[keep_loops]) for name, active, array in uvs],
+               colors=[(name, active, array[keep_loops]) for name, active, array in colors])
+
+
+def get_mesh_arrays(mesh, normals=False):
+    '''
+    read everything join_mesh_arrays() needs from the mesh, optionally including the split normals
+    '''
+
+    arrays = {'verts': get_element_data(mesh.vertices, vert_props),
+              'edges': get_element_data(mesh.edges, edge_props),
+              'faces': get_element_data(mesh.polygons, face_props),
+              'materials': list(mesh.materials),
+              'loop_count': len(mesh.loops)}
+
+    edge_verts = np.empty((len(mesh.edges), 2), dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edge_verts.reshape(-1))
+    arrays['edge_verts'] = edge_verts
+
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+    arrays['loop_totals'] = loop_totals
+
+    arrays['loop_verts'], arrays['loop_edges'], _ = get_loop_face_indices(mesh)
+    arrays['uvs'], arrays['colors'] = get_loop_layer_data(mesh)
+
+    if normals:
+        mesh.calc_normals_split()
+
+        split_normals = np.empty((len(mesh.loops), 3), dtype=np.float32)
+        mesh.loops.foreach_get('normal', split_normals.reshape(-1))
+        arrays['normals'] = split_normals
+
+    return arrays
+
+
+def get_material_map(target, materials):
+    '''
+    map material indices to the target's material slots, appending materials the target doesn't have yet
+    '''
+
+    if not materials:
+        return np.zeros(1, dtype=np.int32)
+
+    material_map = []
+
+    for mat in materials:
+        if mat and mat.name in target.data.materials:
+            material_map.append(target.data.materials.find(mat.name))
+
+        else:
+            target.data.materials.append(mat)
+            material_map.append(len(target.data.materials) - 1)
+
+    return np.array(material_map, dtype=np.int32)
+
+
+def join_mesh_arrays(target, sources, select=[], custom_normals=False):
+    '''
+    append the sources, a list of (arrays, mx) tuples, with the arrays as returned by get_mesh_arrays(), to the target mesh and rebuild it in one go
+    mx transforms the source coords into the target's local space, pass None for sources already in local space
+    each face's source is stored in the M3_source face attribute, 0 for the target, and 1, 2, .. for the sources
+    faces of sources, whose index is in select, will be selected
+    '''
+
+    sources = [(get_mesh_arrays(target.data, normals=custom_normals), None)] + list(sources)
+
+    verts, edges, faces = [], [], []
+    edge_verts, loop_totals, loop_verts, loop_edges = [], [], [], []
+    uvs, colors, loop_counts, source_ids, normals = [], [], [], [], []
+
+    vert_offset = 0
+    edge_offset = 0
+
+    for idx, (arrays, mx) in enumerate(sources):
+        v = dict(arrays['verts'])
+        f = dict(arrays['faces'])
+
+        if mx is not None:
+            mx = np.array(mx, dtype=np.float32)
+            v['co'] = v['co'] @ mx[:3, :3].T + mx[:3, 3]
+
+        material_map = np.arange(max(len(arrays['materials']), 1), dtype=np.int32) if idx == 0 else get_material_map(target, arrays['materials'])
+        f['material_index'] = material_map[np.clip(f['material_index'], 0, len(material_map) - 1)]
+
+        verts.append(v)
+        edges.append(arrays['edges'])
+        faces.append(f)
+
+        edge_verts.append(arrays['edge_verts'] + vert_offset)
+        loop_totals.append(arrays['loop_totals'])
+        loop_verts.append(arrays['loop_verts'] + vert_offset)
+        loop_edges.append(arrays['loop_edges'] + edge_offset)
+
+        uvs.append(arrays['uvs'])
+        colors.append(arrays['colors'])
+        loop_counts.append(arrays['loop_count'])
+
+        source_ids.append(np.full(len(arrays['loop_totals']), idx, dtype=np.int32))
+
+        if custom_normals:
+            n = arrays['normals']
+
+            if mx is not None:
+                n = n @ np.linalg.inv(mx[:3, :3])
+                n /= np.linalg.norm(n, axis=1)[:, None].clip(min=1e-8)
+
+            normals.append(n)
+
+        vert_offset += len(v['co'])
+        edge_offset += len(arrays['edge_verts'])
+
+    verts = {prop: np.concatenate([v[prop] for v in verts]) for prop in verts[0]}
+    edges = {prop: np.concatenate([e[prop] for e in edges]) for prop in edges[0]}
+    faces = {prop: np.concatenate([f[prop] for f in faces]) for prop in faces[0]}
+
+    edge_verts = np.concatenate(edge_verts)
+    loop_totals = np.concatenate(loop_totals)
+    loop_verts = np.concatenate(loop_verts)
+    loop_edges = np.concatenate(loop_edges)
+    source_ids = np.concatenate(source_ids)
+
+    # select the faces of the passed in sources, and flush it to their edges and verts
+    if select:
+        selected = np.isin(source_ids, select)
+        selected_loops = np.repeat(selected, loop_totals)
+
+        faces['select'][selected] = True
+        edges['select'][loop_edges[selected_loops]] = True
+        verts['select'][loop_verts[selected_loops]] = True
+
+    build_mesh(target.data, verts, edges, edge_verts, faces, loop_totals, loop_verts, loop_edges, uvs=merge_loop_layers(uvs, loop_counts, 2), colors=merge_loop_layers(colors, loop_counts, 4))
+
+    source = target.data.attributes.get('M3_source') or target.data.attributes.new('M3_source', 'INT', 'FACE')
+    source.data.foreach_set('value', source_ids)
+
+    if custom_normals:
+        target.data.use_auto_smooth = True
+        target.data.normals_split_custom_set(np.concatenate(normals))
+
+
+def join(target, objects, select=[]):
+    '''
+    join the objects into the target, by reading all mesh data into arrays, and building the target mesh from them in one go
+    faces of objects, whose index - starting at 1 - is in select, will be selected
+    the object meshes are removed afterwards
+    '''
+
+    meshes = [obj.data for obj in objects]
+
+    # shape keys, vertex groups and generic attributes can't be carried over, so use the bmesh join in that case
+    if any(mesh.shape_keys for mesh in [target.data] + meshes) or any(has_extra_mesh_data(obj.data, [obj], normals=False) for obj in [target] + objects):
+        join_bmesh(target, objects, select=select)
+        return
+
+    if any([mesh.use_auto_smooth for mesh in meshes]):
+        target.data.use_auto_smooth = True
+
+    custom_normals = any(mesh.has_custom_normals for mesh in [target.data] + meshes)
+
+    mxi = target.matrix_world.inverted_safe()
+    sources = [(get_mesh_arrays(obj.data, normals=custom_normals), mxi @ obj.matrix_world) for obj in objects]
+
+    join_mesh_arrays(target, sources, select=select, custom_normals=custom_normals)
+
+    for mesh in meshes:
+        bpy.data.meshes.remove(mesh, do_unlink=True)
+
+
+def merge_loop_layers(layers, loop_counts, dimension):
+    '''
+    merge the per mesh loop layer lists, as returned by get_loop_layer_data(), into a single list by layer name
+    meshes missing a layer are filled with zeros, the active layer is taken from the first mesh that has one
+    '''
+
+    names = []
+    active = None
+
+    for mesh_layers in layers:
+        for name, is_active, _ in mesh_layers:
+            if name not in names:
+                names.append(name)
+
+            if is_active and active is None:
+                active = name
+
+    merged = []
+
+    for name in names:
+        arrays = []
+
+        for mesh_layers, count in zip(layers, loop_counts):
+            array = next((array for n, _, array in mesh_layers if n == name), None)
+            arrays.append(array if array is not None else np.zeros((count, dimension), dtype=np.float32))
+
+        merged.append((name, name == active, np.concatenate(arrays)))
+
+    return merged
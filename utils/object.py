@@ -4,6 +4,114 @@ from mathutils import Matrix
 from . math import flatten_matrix
 
 
+# HIERARCHY
+
+# parent -> children index, built in a single pass over all objects, because obj.children scans every object in the file on each access
+hierarchy = None
+
+# names of objects whose parent or group state changed since clean_up_groups() last ran, None if they aren't known and everything needs to be checked
+hierarchy_changes = None
+
+
+def get_hierarchy():
+    global hierarchy
+
+    if hierarchy is None:
+        children = {}
+        parents = {}
+        group_empties = set()
+
+        for obj in bpy.data.objects:
+            parents[obj] = obj.parent
+
+            if obj.parent:
+                children.setdefault(obj.parent, []).append(obj)
+
+            if obj.M3.is_group_empty:
+                group_empties.add(obj)
+
+        hierarchy = {'children': children,
+                     'parents': parents,
+                     'group_empties': group_empties,
+                     'count': len(bpy.data.objects)}
+
+    return hierarchy
+
+
+def invalidate_hierarchy():
+    global hierarchy
+    hierarchy = None
+
+
+def check_hierarchy(depsgraph):
+    '''
+    invalidate the hierarchy index, if objects were added or removed, or any of the updated objects changed its parent or group empty state
+    the changed objects and their old and new parents are tagged for the next group clean up
+    '''
+
+    objects = [update.id.original for update in depsgraph.updates if isinstance(update.id, bpy.types.Object)]
+
+    # without an index, there is nothing to compare against, so all updated objects are considered changed
+    if hierarchy is None:
+        tag_hierarchy_changes(*objects)
+        return
+
+    parents = hierarchy['parents']
+    group_empties = hierarchy['group_empties']
+
+    changed = len(bpy.data.objects) != hierarchy['count']
+
+    for obj in objects:
+        if obj not in parents or parents[obj] != obj.parent or obj.M3.is_group_empty != (obj in group_empties):
+            tag_hierarchy_changes(obj, parents.get(obj), obj.parent)
+            changed = True
+
+    if changed:
+        invalidate_hierarchy()
+
+
+def tag_hierarchy_changes(*objects):
+    if hierarchy_changes is not None:
+        for obj in objects:
+            if obj:
+                try:
+                    hierarchy_changes.add(obj.name)
+
+                # removed objects
+                except ReferenceError:
+                    pass
+
+
+def pop_hierarchy_changes():
+    '''
+    return the names of the objects tagged since the last call, or None if they aren't known, and start tracking anew
+    '''
+
+    global hierarchy_changes
+
+    changes = hierarchy_changes
+    hierarchy_changes = set()
+
+    return changes
+
+
+def reset_hierarchy_changes():
+    global hierarchy_changes
+    hierarchy_changes = None
+
+
+def get_children(obj):
+    '''
+    indexed replacement for obj.children
+    '''
+
+    return list(get_hierarchy()['children'].get(obj, []))
+
+
+def get_group_empties():
+    return set(get_hierarchy()['group_empties'])
+
+
 def parent(obj, parentobj):
     if obj.parent:
         unparent(obj)
@@ -11,18 +119,25 @@ def parent(obj, parentobj):
     obj.parent = parentobj
     obj.matrix_parent_inverse = parentobj.matrix_world.inverted_safe()
 
+    invalidate_hierarchy()
+    tag_hierarchy_changes(obj, parentobj)
+
 
 def unparent(obj):
     if obj.parent:
+        tag_hierarchy_changes(obj, obj.parent)
+
         omx = obj.matrix_world.copy()
         obj.parent = None
         obj.matrix_world = omx
 
+        invalidate_hierarchy()
+
 
 def unparent_children(obj):
     children = []
 
-    for c in obj.children:
+    for c in get_children(obj):
         unparent(c)
         children.append(c)
 
@@ -36,7 +151,7 @@ def compensate_children(obj, oldmx, newmx):
 
     # the delta matrix, aka the old mx expressed in the new one's local space
     deltamx = newmx.inverted_safe() @ oldmx
-    children = [c for c in obj.children]
+    children = get_children(obj)
 
     for c in children:
         pmx = c.matrix_parent_inverse
@@ -92,7 +207,7 @@ def set_obj_origin(obj, mx, bm=None, decalmachine=False, meshmachine=False):
     omx = obj.matrix_world.copy()
 
     # get children and compensate for the parent transform
-    children = [c for c in obj.children]
+    children = get_children(obj)
     compensate_children(obj, omx, mx)
 
     # object mx expressed in new mx's local space, this is the "difference matrix" representing the origin change
@@ -1,10 +1,12 @@
 import bpy
 from bpy.utils import register_class, unregister_class, previews
 import os
+import time
 from importlib import import_module
 from .. registration import keys as keysdict
 from .. registration import classes as classesdict
-from .. msgbus import group_name_change, group_color_change
+from . developer import startup_section, profile_section
+from .. msgbus import group_name_change, group_color_change, clear_dispatch
 
 
 def get_path():
@@ -24,29 +26,50 @@ def get_addon(addon, debug=False):
     look for addon by name
     return registration status, foldername, version and path
     """
-    import addon_utils
-
-
-    for mod in addon_utils.modules():
-        name = mod.bl_info["name"]
-        version = mod.bl_info.get("version", None)
-        foldername = mod.__name__
-        path = mod.__file__
-        enabled = addon_utils.check(foldername)[1]
-
-        if name == addon:
-            if debug:
-                print(name)
-                print("  enabled:", enabled)
-                print("  folder name:", foldername)
-                print("  version:", version)
-                print("  path:", path)
-                print()
-
-            return enabled, foldername, version, path
+
+    addons = get_addons()
+
+    if addon in addons:
+        enabled, foldername, version, path = addons[addon]
+
+        if debug:
+            print(addon)
+            print("  enabled:", enabled)
+            print("  folder name:", foldername)
+            print("  version:", version)
+            print("  path:", path)
+            print()
+
+        return enabled, foldername, version, path
     return False, None, None, None
 
 
+def get_addons():
+    '''
+    return the addon name -> (enabled, foldername, version, path) cache, filled in a single scan of addon_utils.modules()
+    addon_utils.modules() walks the addon folders on disk, so it is only done again once addons are enabled or disabled
+    '''
+
+    global addon_cache
+
+    check_addons_state()
+
+    if addon_cache is None:
+        import addon_utils
+
+        addon_cache = {}
+
+        for mod in addon_utils.modules():
+            name = mod.bl_info["name"]
+
+            # like before, the first addon found for a name wins
+            if name not in addon_cache:
+                foldername = mod.__name__
+                addon_cache[name] = (addon_utils.check(foldername)[1], foldername, mod.bl_info.get("version", None), mod.__file__)
+
+    return addon_cache
+
+
 def get_addon_operator_idnames(addon):
     if addon in ['MACHIN3tools', 'DECALmachine', 'MESHmachine', 'HyperCursor']:
         if addon in ['DECALmachine', 'MESHmachine', 'HyperCursor']:
@@ -64,6 +87,69 @@ def get_addon_operator_idnames(addon):
         return idnames
 
 
+# ADDON CACHES
+
+addon_abbr_mapping = {'MACHIN3tools': 'M3',
+                      'DECALmachine': 'DM',
+                      'MESHmachine': 'MM',
+                      'HyperCursor': 'HC'}
+
+# the number of enabled addons, and the last one's module name, at the time the caches were filled
+# enabling appends an addon, and disabling removes one, so this cheaply detects both, without going over all enabled addons on every lookup
+addons_state = None
+
+# addon name -> (enabled, foldername, version, path)
+addon_cache = None
+
+# operator idname -> addon abbreviation, for all operators of the supported addons
+idname_index = None
+
+
+def check_addons_state():
+    '''
+    drop the addon cache and the operator addon index, if addons were enabled or disabled since they were filled
+    '''
+
+    global addons_state, addon_cache, idname_index
+
+    addons = bpy.context.preferences.addons
+    state = (len(addons), addons[-1].module if len(addons) else None)
+
+    if state != addons_state:
+        addons_state = state
+        addon_cache = None
+        idname_index = None
+
+
+def get_idname_index():
+    global idname_index
+
+    check_addons_state()
+
+    if idname_index is None:
+        idname_index = {}
+
+        # addons earlier in the mapping take precedence, for idnames used by multiple addons
+        for addon, abbr in addon_abbr_mapping.items():
+            for idname in get_addon_operator_idnames(addon):
+                idname_index.setdefault(idname, abbr)
+
+    return idname_index
+
+
+def get_operator_addon(idname):
+    '''
+    return the abbreviation of the addon the passed in operator idname belongs to, or None
+    '''
+
+    if idname.startswith('hops.'):
+        return 'HO'
+    elif idname.startswith('bc.'):
+        return 'BC'
+
+    return get_idname_index().get(idname)
+
+
 def get_addon_prefs(addon):
     _, foldername, _, _ = get_addon(addon)
     return bpy.context.preferences.addons.get(foldername).preferences
@@ -71,7 +157,12 @@ def get_addon_prefs(addon):
 
 # CLASS REGISTRATION
 
-def register_classes(classlists, debug=False):
+@startup_section('register_classes')
+def register_classes(classlists, debug=False, timings=None):
+    '''
+    optionally collect import and registration times per module in the passed in timings dict
+    '''
+
     classes = []
 
     for classlist in classlists:
@@ -79,18 +170,39 @@ def register_classes(classlists, debug=False):
             impline = "from ..%s import %s" % (fr, ", ".join([i[0] for i in imps]))
             classline = "classes.extend([%s])" % (", ".join([i[0] for i in imps]))
 
-            exec(impline)
-            exec(classline)
+            start = time.perf_counter()
+
+            with profile_section(f"import {fr}"):
+                exec(impline)
+                exec(classline)
+
+            if timings is not None:
+                timings.setdefault(fr, {'import': 0, 'register': 0})['import'] += time.perf_counter() - start
 
     for c in classes:
         if debug:
             print("REGISTERING", c)
 
+        start = time.perf_counter()
+
         register_class(c)
 
+        if timings is not None:
+            timings.setdefault(c.__module__.split('.', 1)[-1], {'import': 0, 'register': 0})['register'] += time.perf_counter() - start
+
     return classes
 
 
+def print_registration_timings(timings, total=None):
+    print("\nMACHIN3tools registration timings")
+
+    for module, t in sorted(timings.items(), key=lambda x: x[1]['import'] + x[1]['register'], reverse=True):
+        print(f" {module}: import {t['import'] * 1000:.2f}ms, register {t['register'] * 1000:.2f}ms")
+
+    if total is not None:
+        print(f" total: {total * 1000:.2f}ms")
+
+
 def unregister_classes(classes, debug=False):
     for c in classes:
         if debug:
@@ -122,6 +234,7 @@ def get_classes(classlist):
 
 # KEYMAP REGISTRATION
 
+@startup_section('register_keymaps')
 def register_keymaps(keylists):
     wm = bpy.context.window_manager
     kc = wm.keyconfigs.addon
@@ -201,27 +314,75 @@ def get_keymaps(keylist):
 # ICON REGISTRATION
 
 
-def register_icons():
-    path = os.path.join(get_prefs().path, "icons")
-    icons = previews.new()
+# icon name -> icon_id, icons are only loaded into the previews collection, once they are requested via get_icon()
+icon_ids = {}
+
+# the time spent loading icons, which used to be spent at startup
+icon_load_time = 0
+
 
-    for i in sorted(os.listdir(path)):
-        if i.endswith(".png"):
-            iconname = i[:-4]
-            filepath = os.path.join(path, i)
+def get_icons_path():
+    return os.path.join(get_path(), "icons")
 
-            icons.load(iconname, filepath, 'IMAGE')
 
-    return icons
+@startup_section('register_icons')
+def register_icons():
+    global icon_load_time
+
+    icon_ids.clear()
+    icon_load_time = 0
+
+    return previews.new()
 
 
 def unregister_icons(icons):
+    if bpy.app.timers.is_registered(warm_up_icons):
+        bpy.app.timers.unregister(warm_up_icons)
+
+    icon_ids.clear()
     previews.remove(icons)
 
 
+def load_icon(icons, name):
+    global icon_load_time
+
+    start = time.perf_counter()
+
+    preview = icons.get(name)
+
+    if preview is None:
+        preview = icons.load(name, os.path.join(get_icons_path(), f"{name}.png"), 'IMAGE')
+
+    icon_ids[name] = preview.icon_id
+
+    icon_load_time += time.perf_counter() - start
+
+    return preview.icon_id
+
+
+def warm_up_icons():
+    '''
+    timer, loading the icons, that haven't been requested yet, a few at a time, so pies and panels don't have to load them when first drawn
+    '''
+
+    from .. import icons
+
+    names = [i[:-4] for i in sorted(os.listdir(get_icons_path())) if i.endswith(".png") and i[:-4] not in icon_ids]
+
+    for name in names[:5]:
+        load_icon(icons, name)
+
+    if len(names) > 5:
+        return 0.1
+
+    if get_prefs().benchmark_registration:
+        print(f"MACHIN3tools loaded {len(icon_ids)} icons in {icon_load_time * 1000:.2f}ms, after startup")
+
+
 # MSGBUS
 
 
+@startup_section('register_msgbus')
 def register_msgbus(owner):
     bpy.msgbus.subscribe_rna(key=(bpy.types.Object, 'color'), owner=owner, args=(), notify=group_color_change)
     bpy.msgbus.subscribe_rna(key=(bpy.types.Object, 'name'), owner=owner, args=(), notify=group_name_change)
@@ -230,6 +391,9 @@ def register_msgbus(owner):
 def unregister_msgbus(owner):
     bpy.msgbus.clear_by_owner(owner)
 
+    # drop notifications, that haven't been dispatched yet
+    clear_dispatch()
+
 
 def reload_msgbus():
     from .. import owner
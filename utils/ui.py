@@ -1,17 +1,20 @@
 import bpy
 import rna_keymap_ui
-
-
-icons = None
+from . registration import icon_ids, load_icon
 
 
 def get_icon(name):
-    global icons
+    '''
+    load the icon on first request, and memoize its icon_id
+    '''
+
+    icon_id = icon_ids.get(name)
 
-    if not icons:
+    if icon_id is None:
         from .. import icons
+        icon_id = load_icon(icons, name)
 
-    return icons[name].icon_id
+    return icon_id
 
 
 # CURSOR
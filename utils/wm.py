@@ -1,192 +1,215 @@
 from . tools import prettify_tool_name
-from . system import printd
-from . registration import get_addon_operator_idnames
+from . registration import get_operator_addon
 
 
-addons = None
+# the processed window manager operators, kept in sync incrementally, by comparing the operator pointers
+operator_history = {'pointers': [],
+                    'entries': []}
 
-addon_abbr_mapping = {'MACHIN3tools': 'M3',
-                      'DECALmachine': 'DM',
-                      'MESHmachine': 'MM',
-                      'HyperCursor': 'HC'}
 
+def get_last_operators(context, count=None, debug=False):
+    '''
+    return (addon, label, idname, prop) tuples for the last count operators, or all of them
+    only operators, that were added since the last call are processed, as well as the very last one, as it may have been redone with different props
+    '''
 
-def get_last_operators(context, debug=False):
-    def get_parent_addon(idname):
-        if idname.startswith('hops.'):
-            return 'HO'
-        elif idname.startswith('bc.'):
-            return 'BC'
+    ops = context.window_manager.operators
+    pointers = operator_history['pointers']
+    entries = operator_history['entries']
 
-        for name, idnames in addons.items():
-            if idname in idnames:
-                return addon_abbr_mapping[name]
-        return None
+    # find the previously last op, all ops after it are new
+    start = 0
+
+    if pointers:
+        for idx in range(len(ops) - 1, -1, -1):
+            if ops[idx].as_pointer() == pointers[-1]:
+                start = idx
 
-    global addons
+                # drop the ops, Blender no longer keeps, from the front, and the previously last op, so it's re-processed
+                del pointers[:max(0, len(pointers) - start - 1)]
+                del entries[:max(0, len(entries) - start - 1)]
 
-    if addons is None:
-        addons = {}
+                pointers.pop()
+                entries.pop()
+                break
 
-        for addon in ['MACHIN3tools', 'DECALmachine', 'MESHmachine', 'HyperCursor']:
-            addons[addon] = get_addon_operator_idnames(addon)
+        # the history was reset, like after an undo, or the previous ops were pushed out entirely
+        else:
+            pointers.clear()
+            entries.clear()
 
-        if debug:
-            printd(addons)
+    for op in ops[start:]:
+        pointers.append(op.as_pointer())
+        entries.append(get_operator_entry(op))
 
+    # collect the last count ops from the end, skipping the ones that aren't shown
     operators = []
 
-    for op in context.window_manager.operators:
-        idname = op.bl_idname.replace('_OT_', '.').lower()
-        label = op.bl_label.replace('MACHIN3: ', '')
-        addon = get_parent_addon(idname)
-        prop = ''
+    for entry in reversed(entries):
+        if entry:
+            operators.append(entry)
 
+            if count and len(operators) == count:
+                break
 
-        # skip pie menu calls
+    operators.reverse()
 
-        if idname.startswith('machin3.call_'):
-            continue
+    # if there aren#t any last ops, it's because you've just done an undo
+    if not operators:
+        operators.append((None, 'Undo', 'ed.undo', ''))
 
-        # show props, special modes and custom labels
+    if debug:
+        for addon, label, idname, prop in operators:
+            print(addon, label, f"({idname})", prop)
+
+    return operators
 
-        # MACHIN3tools
 
-        elif idname == 'machin3.set_tool_by_name':
-            prop = prettify_tool_name(op.properties.get('name', ''))
+def get_operator_entry(op):
+    '''
+    return the (addon, label, idname, prop) tuple shown in the screen cast for the passed in operator, or None for ops that aren't shown
+    '''
 
-        elif idname == 'machin3.switch_workspace':
-            prop = op.properties.get('name', '')
+    idname = op.bl_idname.replace('_OT_', '.').lower()
+    label = op.bl_label.replace('MACHIN3: ', '')
+    addon = get_operator_addon(idname)
+    prop = ''
 
-        elif idname == 'machin3.switch_shading':
-            toggled_overlays = getattr(op, 'toggled_overlays', False)
-            prop = op.properties.get('shading_type', '').capitalize()
 
-            if toggled_overlays:
-                label = f"{toggled_overlays} Overlays"
+    # skip pie menu calls
 
-        elif idname == 'machin3.edit_mode':
-            toggled_object = getattr(op, 'toggled_object', False)
-            label = 'Object Mode' if toggled_object else 'Edit Mesh Mode'
+    if idname.startswith('machin3.call_'):
+        return None
 
-        elif idname == 'machin3.mesh_mode':
-            mode = op.properties.get('mode', '')
-            label = f"{mode.capitalize()} Mode"
+    # show props, special modes and custom labels
 
-        elif idname == 'machin3.smart_vert':
-            if op.properties.get('slideoverride', ''):
-                prop = 'SideExtend'
+    # MACHIN3tools
 
-            elif op.properties.get('vertbevel', False):
-                prop = 'VertBevel'
+    elif idname == 'machin3.set_tool_by_name':
+        prop = prettify_tool_name(op.properties.get('name', ''))
 
-            else:
-                modeint = op.properties.get('mode')
-                mergetypeint = op.properties.get('mergetype')
-                mousemerge = getattr(op, 'mousemerge', False)
+    elif idname == 'machin3.switch_workspace':
+        prop = op.properties.get('name', '')
+
+    elif idname == 'machin3.switch_shading':
+        toggled_overlays = getattr(op, 'toggled_overlays', False)
+        prop = op.properties.get('shading_type', '').capitalize()
 
-                mode = 'Merge' if modeint== 0 else 'Connect'
-                mergetype = 'AtMouse' if mousemerge else 'AtLast' if mergetypeint == 0 else 'AtCenter' if mergetypeint == 1 else 'Paths'
+        if toggled_overlays:
+            label = f"{toggled_overlays} Overlays"
 
-                if mode == 'Merge':
-                    prop = mode + mergetype
-                else:
-                    pathtype = getattr(op, 'pathtype', False)
-                    prop = mode + 'Pathsby' + pathtype.title()
+    elif idname == 'machin3.edit_mode':
+        toggled_object = getattr(op, 'toggled_object', False)
+        label = 'Object Mode' if toggled_object else 'Edit Mesh Mode'
 
+    elif idname == 'machin3.mesh_mode':
+        mode = op.properties.get('mode', '')
+        label = f"{mode.capitalize()} Mode"
 
-        elif idname == 'machin3.smart_edge':
-            if op.properties.get('is_knife_project', False):
-                prop = 'KnifeProject'
+    elif idname == 'machin3.smart_vert':
+        if op.properties.get('slideoverride', ''):
+            prop = 'SideExtend'
 
-            elif op.properties.get('sharp', False):
-                mode = getattr(op, 'sharp_mode')
+        elif op.properties.get('vertbevel', False):
+            prop = 'VertBevel'
 
-                if mode == 'SHARPEN':
-                    prop = 'ToggleSharp'
-                elif mode == 'CHAMFER':
-                    prop = 'ToggleChamfer'
-                elif mode == 'KOREAN':
-                    prop = 'ToggleKoreanBevel'
+        else:
+            modeint = op.properties.get('mode')
+            mergetypeint = op.properties.get('mergetype')
+            mousemerge = getattr(op, 'mousemerge', False)
 
-            elif op.properties.get('offset', False):
-                prop = 'KoreanBevel'
+            mode = 'Merge' if modeint== 0 else 'Connect'
+            mergetype = 'AtMouse' if mousemerge else 'AtLast' if mergetypeint == 0 else 'AtCenter' if mergetypeint == 1 else 'Paths'
 
-            elif getattr(op, 'draw_bridge_props'):
-                prop = 'Bridge'
+            if mode == 'Merge':
+                prop = mode + mergetype
+            else:
+                pathtype = getattr(op, 'pathtype', False)
+                prop = mode + 'Pathsby' + pathtype.title()
 
-            elif getattr(op, 'is_knife'):
-                prop = 'Knife'
 
-            elif getattr(op, 'is_connect'):
-                prop = 'Connect'
+    elif idname == 'machin3.smart_edge':
+        if op.properties.get('is_knife_project', False):
+            prop = 'KnifeProject'
 
-            elif getattr(op, 'is_starconnect'):
-                prop = 'StarConnect'
+        elif op.properties.get('sharp', False):
+            mode = getattr(op, 'sharp_mode')
 
-            elif getattr(op, 'is_select'):
-                mode = getattr(op, 'select_mode')
+            if mode == 'SHARPEN':
+                prop = 'ToggleSharp'
+            elif mode == 'CHAMFER':
+                prop = 'ToggleChamfer'
+            elif mode == 'KOREAN':
+                prop = 'ToggleKoreanBevel'
 
-                if getattr(op, 'is_region'):
-                    prop = 'SelectRegion'
-                else:
-                    prop = f'Select{mode.title()}'
+        elif op.properties.get('offset', False):
+            prop = 'KoreanBevel'
 
-            elif getattr(op, 'is_loop_cut'):
-                prop = 'LoopCut'
+        elif getattr(op, 'draw_bridge_props'):
+            prop = 'Bridge'
 
-            elif getattr(op, 'is_turn'):
-                prop = 'Turn'
+        elif getattr(op, 'is_knife'):
+            prop = 'Knife'
 
-        elif idname == 'machin3.smart_face':
-            mode = getattr(op, 'mode')
+        elif getattr(op, 'is_connect'):
+            prop = 'Connect'
 
-            if mode[0]:
-                prop = "FaceFromVert"
-            if mode[1]:
-                prop = "FaceFromEdge"
-            elif mode[2]:
-                prop = "MeshFromFaces"
+        elif getattr(op, 'is_starconnect'):
+            prop = 'StarConnect'
 
-        elif idname == 'machin3.focus':
-            if op.properties.get('method', 0) == 1:
-                prop = 'LocalView'
+        elif getattr(op, 'is_select'):
+            mode = getattr(op, 'select_mode')
 
-        # DECALmachine
+            if getattr(op, 'is_region'):
+                prop = 'SelectRegion'
+            else:
+                prop = f'Select{mode.title()}'
 
-        elif idname == 'machin3.decal_library_visibility_preset':
-            label = f"{label} {op.properties.get('name')}"
-            prop = 'Store' if op.properties.get('store') else 'Recall'
+        elif getattr(op, 'is_loop_cut'):
+            prop = 'LoopCut'
 
+        elif getattr(op, 'is_turn'):
+            prop = 'Turn'
 
-        # MESHmachine
+    elif idname == 'machin3.smart_face':
+        mode = getattr(op, 'mode')
 
-        elif idname == 'machin3.select':
-            if getattr(op, 'vgroup', False):
-                prop = 'VertexGroup'
-            elif getattr(op, 'faceloop', False):
-                prop = 'FaceLoop'
-            else:
-                prop = 'Loop' if op.properties.get('loop', False) else 'Sharp'
+        if mode[0]:
+            prop = "FaceFromVert"
+        if mode[1]:
+            prop = "FaceFromEdge"
+        elif mode[2]:
+            prop = "MeshFromFaces"
 
-        elif idname == 'machin3.boolean':
-            prop = getattr(op, 'method', False).capitalize()
+    elif idname == 'machin3.focus':
+        if op.properties.get('method', 0) == 1:
+            prop = 'LocalView'
 
+    # DECALmachine
 
-        # HyperCursor
+    elif idname == 'machin3.decal_library_visibility_preset':
+        label = f"{label} {op.properties.get('name')}"
+        prop = 'Store' if op.properties.get('store') else 'Recall'
 
-        elif idname == 'machin3.add_object_at_cursor':
-            prop = getattr(op, 'type', False).capitalize()
 
+    # MESHmachine
 
-        operators.append((addon, label, idname, prop))
+    elif idname == 'machin3.select':
+        if getattr(op, 'vgroup', False):
+            prop = 'VertexGroup'
+        elif getattr(op, 'faceloop', False):
+            prop = 'FaceLoop'
+        else:
+            prop = 'Loop' if op.properties.get('loop', False) else 'Sharp'
 
-    # if there aren#t any last ops, it's because you've just done an undo
-    if not operators:
-        operators.append((None, 'Undo', 'ed.undo', ''))
+    elif idname == 'machin3.boolean':
+        prop = getattr(op, 'method', False).capitalize()
 
-    if debug:
-        for addon, label, idname, prop in operators:
-            print(addon, label, f"({idname})", prop)
 
-    return operators
+    # HyperCursor
+
+    elif idname == 'machin3.add_object_at_cursor':
+        prop = getattr(op, 'type', False).capitalize()
+
+
+    return (addon, label, idname, prop)